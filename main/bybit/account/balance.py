@@ -1,17 +1,14 @@
 """Bybit balance operations"""
-import requests
-from main.shared.config import BYBIT_API_BASE
-from main.bybit.helper.auth import sign_request
+from main.bybit.helper.client import get_client
 
 def get_balance(coin, account_type):
     """Get balance for a specific coin in an account"""
     coin = coin.upper()
-    response = requests.get(
-        f"{BYBIT_API_BASE}/v5/asset/transfer/query-account-coins-balance",
+    data = get_client().get(
+        "/v5/asset/transfer/query-account-coins-balance",
         params={"accountType": account_type, "coin": coin},
-        headers=sign_request(f"accountType={account_type}&coin={coin}")
+        auth=True
     )
-    data = response.json()
     if data.get("retCode") == 0:
         balance_list = data.get("result", {}).get("balance", [])
         if balance_list:
@@ -20,12 +17,11 @@ def get_balance(coin, account_type):
 
 def get_all_balances(account_type):
     """Get all non-zero balances in an account"""
-    response = requests.get(
-        f"{BYBIT_API_BASE}/v5/asset/transfer/query-account-coins-balance",
+    data = get_client().get(
+        "/v5/asset/transfer/query-account-coins-balance",
         params={"accountType": account_type},
-        headers=sign_request(f"accountType={account_type}")
+        auth=True
     )
-    data = response.json()
     balances = {}
     if data.get("retCode") == 0:
         balance_list = data.get("result", {}).get("balance", [])
@@ -1,10 +1,7 @@
 """Bybit spot trading"""
-import json
-import requests
 import time
-from main.shared.config import BYBIT_API_BASE
 from main.shared.data import get_pair_info
-from main.bybit.helper.auth import sign_request
+from main.bybit.helper.client import get_client
 from main.bybit.monitor.pricing import get_sell_rate
 from main.bybit.account.transfers import transfer_to_unified
 
@@ -26,12 +23,7 @@ def place_market_order(symbol: str, side: str, qty: float, market_unit: str = No
     }
     if market_unit:
         params["marketUnit"] = market_unit
-    response = requests.post(
-        f"{BYBIT_API_BASE}/v5/order/create",
-        json=params,
-        headers=sign_request(json.dumps(params))
-    )
-    data = response.json()
+    data = get_client().post("/v5/order/create", params)
     if data.get("retCode") != 0:
         raise ValueError(f"Order failed: {data.get('retMsg')}")
     return data["result"]
@@ -58,12 +50,7 @@ def place_limit_order(symbol: str, side: str, qty: float, price: float, time_in_
         "price": str(price),
         "timeInForce": time_in_force
     }
-    response = requests.post(
-        f"{BYBIT_API_BASE}/v5/order/create",
-        json=params,
-        headers=sign_request(json.dumps(params))
-    )
-    data = response.json()
+    data = get_client().post("/v5/order/create", params)
     if data.get("retCode") != 0:
         return {
             "status": "failed",
@@ -75,6 +62,14 @@ def place_limit_order(symbol: str, side: str, qty: float, price: float, time_in_
         **data["result"]
     }
 
+def get_order(order_id: str) -> dict:
+    """Look up a spot order by ID in the order history (None if Bybit does not know it yet)"""
+    data = get_client().get("/v5/order/history", params={"category": "spot", "orderId": order_id}, auth=True)
+    if data.get("retCode") != 0:
+        raise ValueError(f"Order query failed: {data.get('retMsg')}")
+    orders = data["result"]["list"]
+    return orders[0] if orders else None
+
 def swap(in_coin: str, out_coin: str, amount: float, amount_unit: str = "in") -> dict:
     """Swap coins on Bybit spot market (requires funds in UNIFIED account)"""
     in_coin, out_coin = in_coin.upper(), out_coin.upper()
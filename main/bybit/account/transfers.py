@@ -1,12 +1,7 @@
 """Bybit internal transfers and withdrawals"""
-import json
 import time
 import uuid
-import hmac
-import hashlib
-import requests
-from main.shared.config import BYBIT_API_BASE, get_bybit_credentials
-from main.bybit.helper.auth import sign_request
+from main.bybit.helper.client import get_client
 
 def internal_transfer(coin, amount, from_account, to_account):
     """Transfer coins between Bybit accounts"""
@@ -18,12 +13,7 @@ def internal_transfer(coin, amount, from_account, to_account):
         "fromAccountType": from_account,
         "toAccountType": to_account
     }
-    response = requests.post(
-        f"{BYBIT_API_BASE}/v5/asset/transfer/inter-transfer",
-        json=params,
-        headers=sign_request(json.dumps(params))
-    )
-    data = response.json()
+    data = get_client().post("/v5/asset/transfer/inter-transfer", params)
     if data.get("retCode") != 0:
         raise ValueError(f"Transfer failed: {data.get('retMsg')}")
     return data["result"]
@@ -92,22 +82,8 @@ def transfer_to_unified(coin=None, amount=None):
 
 def get_deposit_address(coin, chain="SOL"):
     """Get deposit address for a coin"""
-    api_key, api_secret = get_bybit_credentials()
-    url = f"{BYBIT_API_BASE}/v5/asset/deposit/query-address"
-    timestamp = str(int(time.time() * 1000))
-    recv_window = "5000"
     coin = coin.upper()
-    param_str = f"coin={coin}&chainType={chain}"
-    sign_str = f"{timestamp}{api_key}{recv_window}{param_str}"
-    signature = hmac.new(api_secret.encode(), sign_str.encode(), hashlib.sha256).hexdigest()
-    headers = {
-        "X-BAPI-API-KEY": api_key,
-        "X-BAPI-SIGN": signature,
-        "X-BAPI-TIMESTAMP": timestamp,
-        "X-BAPI-RECV-WINDOW": recv_window,
-    }
-    response = requests.get(url, params={"coin": coin, "chainType": chain}, headers=headers)
-    data = response.json()
+    data = get_client().get("/v5/asset/deposit/query-address", params={"coin": coin, "chainType": chain}, auth=True)
     if data.get("retCode") != 0:
         raise ValueError(f"Bybit API error: {data.get('retMsg')}")
     for chain_info in data.get("result", {}).get("chains", []):
@@ -115,16 +91,18 @@ def get_deposit_address(coin, chain="SOL"):
             return chain_info["addressDeposit"]
     raise ValueError(f"No {chain} deposit address found for {coin}")
 
+def get_deposit_records(coin, limit=20):
+    """Recent on-chain deposit records for a coin (newest first, 'txID', 'amount', 'status': 3 = success)"""
+    coin = coin.upper()
+    data = get_client().get("/v5/asset/deposit/query-record", params={"coin": coin, "limit": limit}, auth=True)
+    if data.get("retCode") != 0:
+        raise ValueError(f"Bybit API error: {data.get('retMsg')}")
+    return data["result"]["rows"]
+
 def get_coin_info(coin):
     """Get coin information including available chains"""
     coin = coin.upper()
-    params = f"coin={coin}"
-    response = requests.get(
-        f"{BYBIT_API_BASE}/v5/asset/coin/query-info",
-        params={"coin": coin},
-        headers=sign_request(params)
-    )
-    data = response.json()
+    data = get_client().get("/v5/asset/coin/query-info", params={"coin": coin}, auth=True)
     if data.get("retCode") != 0:
         raise ValueError(f"Failed to get coin info: {data.get('retMsg')}")
     return data["result"]
@@ -139,12 +117,7 @@ def create_withdrawal(coin, amount, address, chain="SOL"):
         "amount": str(amount),
         "timestamp": str(int(time.time() * 1000))
     }
-    response = requests.post(
-        f"{BYBIT_API_BASE}/v5/asset/withdraw/create",
-        json=params,
-        headers=sign_request(json.dumps(params))
-    )
-    data = response.json()
+    data = get_client().post("/v5/asset/withdraw/create", params)
     if data.get("retCode") != 0:
         error_msg = data.get('retMsg')
         if "chain or destination tag" in error_msg.lower():
@@ -1,23 +1,9 @@
 """Bybit API authentication"""
-import time
-import hmac
-import hashlib
-from main.shared.config import get_bybit_credentials
+from main.bybit.helper.client import get_client
 
 def sign_request(param_str):
-    """Create signature headers for Bybit API request"""
-    api_key, api_secret = get_bybit_credentials()
-    timestamp = str(int(time.time() * 1000))
-    recv_window = "20000"
-    sign_str = f"{timestamp}{api_key}{recv_window}{param_str}"
-    signature = hmac.new(api_secret.encode(), sign_str.encode(), hashlib.sha256).hexdigest()
-    return {
-        "X-BAPI-API-KEY": api_key,
-        "X-BAPI-SIGN": signature,
-        "X-BAPI-TIMESTAMP": timestamp,
-        "X-BAPI-RECV-WINDOW": recv_window,
-        "Content-Type": "application/json"
-    }
+    """Create signature headers for Bybit API request (cached signing key, server-aligned timestamp)"""
+    return get_client().sign(param_str)
 
 def create_headers(params=None):
     """Create authenticated headers for Bybit API"""
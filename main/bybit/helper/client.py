@@ -0,0 +1,166 @@
+"""Bybit REST client with pooled keep-alive connections and request signing"""
+import hashlib
+import hmac
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from main.shared.config import (
+    BYBIT_API_BASE, BYBIT_RECV_WINDOW, BYBIT_TIME_SYNC_INTERVAL, BYBIT_TIMEOUTS, get_bybit_credentials
+)
+from main.shared.rate_limit import get_bucket, retry_after
+
+_client_instance = None
+_client_lock = threading.Lock()
+
+class BybitClient:
+    """One pooled Session, a pre-keyed HMAC signer and the server clock offset
+
+    The API secret is read and keyed into an HMAC object once; each request
+    signs on a copy of it. Timestamps are shifted by the offset measured
+    against /v5/market/time so a drifting local clock stays inside recv_window.
+    """
+
+    def __init__(self, base_url=BYBIT_API_BASE, pool_size=32):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.api_key = None
+        self.signer = None
+        self.time_offset_ms = 0
+        self.synced_at = None
+        self.lock = threading.Lock()
+        self.time_lock = threading.Lock()
+
+    def _load_credentials(self):
+        with self.lock:
+            if self.signer is None:
+                api_key, api_secret = get_bybit_credentials()
+                self.api_key = api_key
+                self.signer = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+
+    def timeout(self, path):
+        """(connect, read) timeout for an endpoint path"""
+        for prefix, timeout in BYBIT_TIMEOUTS.items():
+            if path.startswith(prefix):
+                return timeout
+
+    def sync_time(self):
+        """Measure local vs server clock offset in ms (server time taken at the round-trip midpoint)"""
+        start = time.time() * 1000
+        data = self.get("/v5/market/time")
+        end = time.time() * 1000
+        server_ms = int(data["result"]["timeNano"]) / 1e6
+        self.time_offset_ms = server_ms - (start + end) / 2
+        self.synced_at = time.monotonic()
+        return self.time_offset_ms
+
+    def _time_stale(self):
+        return self.synced_at is None or time.monotonic() - self.synced_at > BYBIT_TIME_SYNC_INTERVAL
+
+    def timestamp(self):
+        """Server-aligned timestamp in ms, re-measuring the offset when it is stale
+
+        One thread re-syncs; the others wait for it instead of syncing too.
+        """
+        if self._time_stale():
+            with self.time_lock:
+                if self._time_stale():
+                    try:
+                        self.sync_time()
+                    except Exception as e:
+                        self.synced_at = time.monotonic()
+                        print(f"⚠️  Bybit time sync failed, using local clock: {e}")
+        return str(int(time.time() * 1000 + self.time_offset_ms))
+
+    def sign(self, param_str, recv_window=BYBIT_RECV_WINDOW):
+        """Signature headers for a query string or JSON body"""
+        if self.signer is None:
+            self._load_credentials()
+        timestamp = self.timestamp()
+        signer = self.signer.copy()
+        signer.update(f"{timestamp}{self.api_key}{recv_window}{param_str}".encode())
+        return {
+            "X-BAPI-API-KEY": self.api_key,
+            "X-BAPI-SIGN": signer.hexdigest(),
+            "X-BAPI-TIMESTAMP": timestamp,
+            "X-BAPI-RECV-WINDOW": recv_window,
+            "Content-Type": "application/json"
+        }
+
+    def ws_auth_args(self, ttl_ms=10000):
+        """Args of a private WebSocket {"op": "auth"} request (signature over GET/realtime + expiry)"""
+        if self.signer is None:
+            self._load_credentials()
+        expires = int(self.timestamp()) + ttl_ms
+        signer = self.signer.copy()
+        signer.update(f"GET/realtime{expires}".encode())
+        return [self.api_key, expires, signer.hexdigest()]
+
+    def _govern(self, bucket, path, response):
+        """Feed Bybit's per-endpoint limit headers (and rejections) back into the rate-limit bucket
+
+        Returns:
+            True if the request was rejected by the rate limiter
+        """
+        remaining = response.headers.get("X-Bapi-Limit-Status")
+        reset_ms = response.headers.get("X-Bapi-Limit-Reset-Timestamp")
+        if response.status_code in (403, 429):
+            delay = bucket.backoff(retry_after(response.headers))
+            print(f"⚠️  Bybit rate limit hit (HTTP {response.status_code}), pausing {delay:.1f}s")
+            return True
+        bucket.success()
+        if remaining is not None and reset_ms is not None:
+            reset_in = (int(reset_ms) - time.time() * 1000 - self.time_offset_ms) / 1000
+            bucket.limit_status(path, int(remaining), reset_in)
+        return False
+
+    def _bucket(self, path):
+        return get_bucket("bybit_market" if path.startswith("/v5/market/") else "bybit_private")
+
+    def _request(self, path, send):
+        """Run send() under the path's bucket, retrying once after a rate-limit rejection
+
+        send is called per attempt so signed requests get a fresh timestamp.
+        Raises ValueError if the retry is rejected too or the body is not JSON.
+        """
+        bucket = self._bucket(path)
+        for attempt in range(2):
+            bucket.wait(path)
+            response = send()
+            if not self._govern(bucket, path, response):
+                break
+        else:
+            raise ValueError(f"Bybit HTTP {response.status_code} on {path} after retry: {response.text[:200]}")
+        try:
+            return response.json()
+        except ValueError:
+            raise ValueError(f"Bybit HTTP {response.status_code} on {path}: {response.text[:200]}")
+
+    def get(self, path, params=None, auth=False):
+        """GET an endpoint, signing the query string when auth is set"""
+        params = params or {}
+
+        def send():
+            headers = self.sign("&".join(f"{k}={v}" for k, v in params.items())) if auth else None
+            return self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout(path))
+        return self._request(path, send)
+
+    def post(self, path, body):
+        """POST a signed JSON body (the exact signed bytes are sent)"""
+        payload = json.dumps(body)
+
+        def send():
+            return self.session.post(f"{self.base_url}{path}", data=payload, headers=self.sign(payload), timeout=self.timeout(path))
+        return self._request(path, send)
+
+def get_client():
+    """Get Bybit REST client (cached singleton)"""
+    global _client_instance
+    with _client_lock:
+        if _client_instance is None:
+            _client_instance = BybitClient()
+    return _client_instance
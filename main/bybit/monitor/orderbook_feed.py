@@ -0,0 +1,171 @@
+"""Bybit public spot WebSocket orderbook feed with locally maintained books"""
+import json
+import threading
+import time
+import websocket
+from main.shared.config import BYBIT_WS_PUBLIC, ORDERBOOK_MAX_AGE
+
+_feed = None
+
+class OrderbookFeed:
+    """Keeps snapshot+delta L2 books for many symbols in memory
+
+    Books are rebuilt from each 'snapshot' message and patched by 'delta' messages.
+    A delta whose update id 'u' does not follow the previous one marks the book
+    stale and resubscribes the topic, which makes Bybit send a fresh snapshot.
+    A book that received no message for max_age seconds is not served either.
+    """
+
+    def __init__(self, base_coins, depth=50, url=BYBIT_WS_PUBLIC, max_age=ORDERBOOK_MAX_AGE):
+        self.topics = [f"orderbook.{depth}.{coin.upper()}USDT" for coin in base_coins]
+        self.url = url
+        self.max_age = max_age
+        self.books = {}
+        self.lock = threading.Lock()
+        self.ws = None
+        self.connected = False
+        self.running = False
+        self.resyncs = 0
+
+    def start(self):
+        """Connect in a background thread (reconnects until stop() is called)"""
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.ws:
+            self.ws.close()
+
+    def wait_ready(self, timeout=10):
+        """Wait until every subscribed symbol has a book, returns True if all arrived"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if len(self.books) == len(self.topics):
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def _run(self):
+        while self.running:
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.handle_message(json.loads(message))
+            )
+            self.ws.run_forever()
+            # Handled here rather than as on_close so every disconnect (also errors) is handled exactly once
+            self._on_close(self.ws, None, None)
+            if self.running:
+                time.sleep(1)
+
+    def _heartbeat(self):
+        while self.running:
+            time.sleep(20)
+            if self.connected:
+                self._send({"op": "ping"})
+
+    def _send(self, message):
+        try:
+            self.ws.send(json.dumps(message))
+        except Exception as e:
+            print(f"⚠️  Orderbook feed send failed: {e}")
+
+    def _on_open(self, ws):
+        self.connected = True
+        # Spot accepts at most 10 topics per subscribe request
+        for i in range(0, len(self.topics), 10):
+            self._send({"op": "subscribe", "args": self.topics[i:i + 10]})
+
+    def _on_close(self, ws, status, message):
+        self.connected = False
+        with self.lock:
+            self.books.clear()
+
+    def handle_message(self, message):
+        """Apply one snapshot/delta message to the local books"""
+        topic = message.get("topic", "")
+        if not topic.startswith("orderbook."):
+            return
+        data = message["data"]
+        symbol = data["s"]
+        with self.lock:
+            book = self.books.get(symbol)
+            # u == 1 means Bybit restarted the service and sent a fresh snapshot
+            if message.get("type") == "snapshot" or data.get("u") == 1:
+                self.books[symbol] = {
+                    "bids": {float(p): float(sz) for p, sz in data["b"]},
+                    "asks": {float(p): float(sz) for p, sz in data["a"]},
+                    "u": data["u"],
+                    "ts": message.get("ts"),
+                    "received": time.monotonic()
+                }
+                return
+            if book is None:
+                return
+            if data["u"] != book["u"] + 1:
+                del self.books[symbol]
+                gap = True
+            else:
+                for side, levels in (("bids", data["b"]), ("asks", data["a"])):
+                    for p, sz in levels:
+                        if float(sz) == 0:
+                            book[side].pop(float(p), None)
+                        else:
+                            book[side][float(p)] = float(sz)
+                book["u"] = data["u"]
+                book["ts"] = message.get("ts")
+                book["received"] = time.monotonic()
+                gap = False
+        if gap:
+            self.resync(topic)
+
+    def resync(self, topic):
+        """Resubscribe a topic so Bybit pushes a new snapshot"""
+        self.resyncs += 1
+        print(f"⚠️  Orderbook sequence gap on {topic}, resyncing")
+        self._send({"op": "unsubscribe", "args": [topic]})
+        self._send({"op": "subscribe", "args": [topic]})
+
+    def _live_book(self, base_coin):
+        """In-sequence book updated within max_age seconds, or None (call with the lock held)"""
+        book = self.books.get(f"{base_coin.upper()}USDT")
+        if not self.connected or book is None or time.monotonic() - book["received"] > self.max_age:
+            return None
+        return book
+
+    def is_live(self, base_coin):
+        """True if the feed is connected and holds a recent in-sequence book for base_coin"""
+        with self.lock:
+            return self._live_book(base_coin) is not None
+
+    def get_orderbook(self, base_coin, depth=20):
+        """Top `depth` levels in the same format as pricing.get_orderbook, None if the book is not live"""
+        with self.lock:
+            book = self._live_book(base_coin)
+            if book is None:
+                return None
+            bids = sorted(book["bids"].items(), reverse=True)[:depth]
+            asks = sorted(book["asks"].items())[:depth]
+        return {"bids": bids, "asks": asks}
+
+def start_orderbook_feed(base_coins=None, depth=50, url=BYBIT_WS_PUBLIC):
+    """Start the shared feed (defaults to every tradeable symbol)"""
+    global _feed
+    from main.shared.data import get_all_tradeable_symbols
+    stop_orderbook_feed()
+    _feed = OrderbookFeed(base_coins or get_all_tradeable_symbols(), depth, url).start()
+    return _feed
+
+def stop_orderbook_feed():
+    global _feed
+    if _feed:
+        _feed.stop()
+    _feed = None
+
+def get_feed():
+    """Shared feed, or None if it was never started"""
+    return _feed
@@ -1,30 +1,125 @@
 """Bybit pricing and market data"""
-import requests
-from main.shared.config import BYBIT_API_BASE
+import numpy as np
+from main.bybit.helper.client import get_client
+from main.bybit.monitor.orderbook_feed import get_feed
 
 def _to_bybit_symbol(base_coin):
     """Convert base coin to Bybit trading pair symbol"""
     return f"{base_coin}USDT"
 
 def get_orderbook(base_coin, depth=20):
-    """Get orderbook from Bybit
+    """Get orderbook from Bybit (from the WebSocket feed when it is live, else REST)
     
     Args:
         base_coin: Base coin symbol (e.g., 'SOL')
         depth: Orderbook depth (default 20)
     """
+    feed = get_feed()
+    book = feed.get_orderbook(base_coin, depth) if feed else None
+    if book is not None:
+        return book
     symbol = _to_bybit_symbol(base_coin)
-    response = requests.get(f"{BYBIT_API_BASE}/v5/market/orderbook", params={
+    result = get_client().get("/v5/market/orderbook", params={
         "category": "spot",
         "symbol": symbol,
         "limit": depth
-    })
-    result = response.json()["result"]
+    })["result"]
     return {
         "bids": [(float(p), float(sz)) for p, sz in result["b"]],
         "asks": [(float(p), float(sz)) for p, sz in result["a"]]
     }
 
+def _side_arrays(levels, descending):
+    """Sorted price/size arrays with cumulative quantity and notional for one book side"""
+    levels = np.array(levels, dtype=float).reshape(-1, 2)
+    order = np.argsort(-levels[:, 0] if descending else levels[:, 0], kind="stable")
+    prices, sizes = levels[order, 0], levels[order, 1]
+    return prices, np.cumsum(sizes), np.cumsum(prices * sizes)
+
+def _scalar_or_array(values):
+    return values.item() if values.ndim == 0 else values
+
+def get_all_tickers():
+    """Get best bid/ask for every USDT spot pair in one request
+    
+    Returns:
+        dict of base coin -> {'bid': best bid, 'ask': best ask}
+    """
+    tickers = {}
+    for item in get_client().get("/v5/market/tickers", params={"category": "spot"})["result"]["list"]:
+        symbol = item["symbol"]
+        if symbol.endswith("USDT") and item.get("bid1Price") and item.get("ask1Price"):
+            tickers[symbol[:-4]] = {"bid": float(item["bid1Price"]), "ask": float(item["ask1Price"])}
+    return tickers
+
+class OrderbookSnapshot:
+    """Orderbook fetched once, answering rate, depth and slippage questions for that instant
+    
+    side is 'buy' (walks asks from the lowest) or 'sell' (walks bids from the highest).
+    qty may be a number or an array of quantities; array inputs give array outputs.
+    """
+
+    def __init__(self, bids, asks):
+        self.sides = {"buy": _side_arrays(asks, False), "sell": _side_arrays(bids, True)}
+
+    def _fill(self, side, qty):
+        """Filled quantity, notional and marginal level index for each qty (binary search)"""
+        prices, cum_qty, cum_notional = self.sides[side]
+        qty = np.asarray(qty, dtype=float)
+        if not len(prices):
+            return np.zeros_like(qty), np.zeros_like(qty), None
+        filled = np.clip(qty, 0, cum_qty[-1])
+        idx = np.minimum(np.searchsorted(cum_qty, filled, side="left"), len(prices) - 1)
+        prev_qty = np.where(idx > 0, cum_qty[idx - 1], 0)
+        prev_notional = np.where(idx > 0, cum_notional[idx - 1], 0)
+        return filled, prev_notional + (filled - prev_qty) * prices[idx], idx
+
+    def vwap(self, side, qty):
+        """Average fill price for qty (0 if nothing can be filled)"""
+        filled, notional, _ = self._fill(side, qty)
+        return _scalar_or_array(np.divide(notional, filled, out=np.zeros_like(filled), where=filled > 0))
+
+    def marginal_price(self, side, qty):
+        """Price of the deepest level touched when filling qty (0 if the book is empty)"""
+        filled, _, idx = self._fill(side, qty)
+        if idx is None:
+            return _scalar_or_array(filled)
+        return _scalar_or_array(self.sides[side][0][idx])
+
+    def depth_within(self, side, pct=0.01):
+        """Quantity resting within pct of the best price"""
+        prices, cum_qty, _ = self.sides[side]
+        if not len(prices):
+            return 0
+        if side == "buy":
+            n = np.searchsorted(prices, prices[0] * (1 + pct), side="right")
+        else:
+            n = np.searchsorted(-prices, -prices[0] * (1 - pct), side="right")
+        return cum_qty[n - 1].item()
+
+    def slippage(self, side, qty):
+        """Estimate slippage using depth ratio method
+        s ≈ 0.01 × V/D_1%
+        where V = quantity, D_1% = depth within 1% of best price
+        """
+        depth_1pct = self.depth_within(side, 0.01)
+        if depth_1pct == 0:
+            return _scalar_or_array(np.zeros_like(np.asarray(qty, dtype=float)))
+        return _scalar_or_array(0.01 * (np.asarray(qty, dtype=float) / depth_1pct))
+
+    def buy_rate(self, qty):
+        """Average buy rate and slippage for qty"""
+        return {"rate": self.vwap("buy", qty), "slippage": self.slippage("buy", qty)}
+
+    def sell_rate(self, qty):
+        """Average sell rate and slippage for qty"""
+        return {"rate": self.vwap("sell", qty), "slippage": self.slippage("sell", qty)}
+
+def get_orderbook_snapshot(base_coin, depth=20):
+    """Fetch orderbook once and wrap it in an OrderbookSnapshot"""
+    book = get_orderbook(base_coin, depth)
+    return OrderbookSnapshot(book["bids"], book["asks"])
+
 def get_buy_rate(base_coin, qty, depth=20):
     """Calculate average buy rate (buying from asks)
     
@@ -33,18 +128,7 @@ def get_buy_rate(base_coin, qty, depth=20):
         qty: Quantity to buy
         depth: Orderbook depth (default 20)
     """
-    asks = get_orderbook(base_coin, depth)["asks"]
-    asks.sort()
-    remaining, cost = qty, 0
-    for price, size in asks:
-        if remaining <= 0:
-            break
-        take = min(remaining, size)
-        cost += take * price
-        remaining -= take
-    rate = cost / (qty - remaining) if qty != remaining else 0
-    slippage = estimate_buy_slippage(base_coin, qty, depth)
-    return {"rate": rate, "slippage": slippage}
+    return get_orderbook_snapshot(base_coin, depth).buy_rate(qty)
 
 def get_sell_rate(base_coin, qty, depth=20):
     """Calculate average sell rate (selling into bids)
@@ -54,18 +138,7 @@ def get_sell_rate(base_coin, qty, depth=20):
         qty: Quantity to sell
         depth: Orderbook depth (default 20)
     """
-    bids = get_orderbook(base_coin, depth)["bids"]
-    bids.sort(reverse=True)
-    remaining, proceeds = qty, 0
-    for price, size in bids:
-        if remaining <= 0:
-            break
-        take = min(remaining, size)
-        proceeds += take * price
-        remaining -= take
-    rate = proceeds / (qty - remaining) if qty != remaining else 0
-    slippage = estimate_sell_slippage(base_coin, qty, depth)
-    return {"rate": rate, "slippage": slippage}
+    return get_orderbook_snapshot(base_coin, depth).sell_rate(qty)
 
 def estimate_buy_slippage(base_coin, qty, depth=20):
     """Estimate buy slippage using depth ratio method
@@ -77,15 +150,7 @@ def estimate_buy_slippage(base_coin, qty, depth=20):
         qty: Quantity to buy
         depth: Orderbook depth (default 20)
     """
-    asks = get_orderbook(base_coin, depth)["asks"]
-    if not asks:
-        return 0
-    best_ask = min(p for p, _ in asks)
-    threshold = best_ask * 1.01
-    depth_1pct = sum(size for price, size in asks if price <= threshold)
-    if depth_1pct == 0:
-        return 0
-    return 0.01 * (qty / depth_1pct)
+    return get_orderbook_snapshot(base_coin, depth).slippage("buy", qty)
 
 def estimate_sell_slippage(base_coin, qty, depth=20):
     """Estimate sell slippage using depth ratio method
@@ -97,12 +162,4 @@ def estimate_sell_slippage(base_coin, qty, depth=20):
         qty: Quantity to sell
         depth: Orderbook depth (default 20)
     """
-    bids = get_orderbook(base_coin, depth)["bids"]
-    if not bids:
-        return 0
-    best_bid = max(p for p, _ in bids)
-    threshold = best_bid * 0.99
-    depth_1pct = sum(size for price, size in bids if price >= threshold)
-    if depth_1pct == 0:
-        return 0
-    return 0.01 * (qty / depth_1pct)
+    return get_orderbook_snapshot(base_coin, depth).slippage("sell", qty)
@@ -0,0 +1,215 @@
+"""Bybit private WebSocket stream: order, execution and wallet events"""
+import json
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import websocket
+from main.shared.config import BYBIT_WS_PRIVATE, BYBIT_ORDER_TIMEOUT
+
+# Order statuses after which nothing more will fill
+FINAL_STATUSES = ("Filled", "Cancelled", "PartiallyFilledCanceled", "Rejected", "Deactivated")
+
+_stream = None
+_stream_lock = threading.Lock()
+
+class PrivateStream:
+    """Authenticated stream keeping the latest orders, fills and wallet balances in memory
+
+    Workflows register waiters (await_order / await_balance) that resolve a Future
+    as soon as a pushed message satisfies them. State already received when a
+    waiter is registered counts, so an order that filled before the REST call
+    returned still resolves immediately.
+    """
+
+    def __init__(self, url=BYBIT_WS_PRIVATE, auth_args=None):
+        self.url = url
+        self.auth_args = auth_args
+        self.orders = {}
+        self.fills = {}
+        self.balances = {}
+        self.waiters = []
+        self.lock = threading.Lock()
+        self.ws = None
+        self.connected = False
+        self.authenticated = False
+        self.running = False
+
+    def start(self):
+        """Connect in a background thread (reconnects until stop() is called)"""
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.ws:
+            self.ws.close()
+
+    def wait_ready(self, timeout=10):
+        """Wait until the stream is authenticated, returns True if it is"""
+        deadline = time.time() + timeout
+        while time.time() < deadline and not self.is_live():
+            time.sleep(0.05)
+        return self.is_live()
+
+    def is_live(self):
+        return self.connected and self.authenticated
+
+    def _run(self):
+        while self.running:
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.handle_message(json.loads(message))
+            )
+            self.ws.run_forever()
+            # Handled here rather than as on_close so every disconnect (also errors) is handled exactly once
+            self._on_close(self.ws, None, None)
+            if self.running:
+                time.sleep(1)
+
+    def _heartbeat(self):
+        while self.running:
+            time.sleep(20)
+            if self.connected:
+                self._send({"op": "ping"})
+
+    def _send(self, message):
+        try:
+            self.ws.send(json.dumps(message))
+        except Exception as e:
+            print(f"⚠️  Private stream send failed: {e}")
+
+    def _on_open(self, ws):
+        self.connected = True
+        if self.auth_args is None:
+            from main.bybit.helper.client import get_client
+            self.auth_args = get_client().ws_auth_args
+        self._send({"op": "auth", "args": self.auth_args()})
+
+    def _on_close(self, ws, status, message):
+        self.connected = False
+        self.authenticated = False
+
+    def handle_message(self, message):
+        """Apply one auth reply or order/execution/wallet push to the in-memory view"""
+        if message.get("op") == "auth":
+            if message.get("success"):
+                self.authenticated = True
+                self._send({"op": "subscribe", "args": ["order", "execution", "wallet"]})
+            else:
+                print(f"❌ Private stream authentication failed: {message.get('ret_msg')}")
+            return
+        topic = message.get("topic")
+        with self.lock:
+            if topic == "order":
+                for order in message["data"]:
+                    self.orders[order["orderId"]] = order
+            elif topic == "execution":
+                for execution in message["data"]:
+                    self.fills.setdefault(execution["orderId"], []).append(execution)
+            elif topic == "wallet":
+                for account in message["data"]:
+                    for coin in account["coin"]:
+                        self.balances[(account["accountType"], coin["coin"])] = float(coin["walletBalance"] or 0)
+            else:
+                return
+            self._check_waiters()
+
+    def _check_waiters(self):
+        pending = []
+        for check, future in self.waiters:
+            if future.cancelled():
+                continue
+            value = check()
+            if value is None:
+                pending.append((check, future))
+            else:
+                future.set_result(value)
+        self.waiters = pending
+
+    def _wait_for(self, check):
+        """Future resolved with check()'s first non-None value (checked now and after every push)"""
+        future = Future()
+        with self.lock:
+            value = check()
+            if value is None:
+                self.waiters.append((check, future))
+            else:
+                future.set_result(value)
+        return future
+
+    def await_order(self, order_id):
+        """Future resolved with the order dict once it reaches a FINAL_STATUSES status"""
+        def check():
+            order = self.orders.get(order_id)
+            return order if order and order["orderStatus"] in FINAL_STATUSES else None
+        return self._wait_for(check)
+
+    def await_balance(self, coin, threshold, account_type="UNIFIED"):
+        """Future resolved with the wallet balance of coin once it is at least threshold"""
+        key = (account_type, coin.upper())
+        def check():
+            balance = self.balances.get(key)
+            return balance if balance is not None and balance >= threshold else None
+        return self._wait_for(check)
+
+    def get_balance(self, coin, account_type="UNIFIED"):
+        """Last pushed wallet balance (None if no wallet update has mentioned the coin yet)"""
+        with self.lock:
+            return self.balances.get((account_type, coin.upper()))
+
+    def get_fills(self, order_id):
+        """Executions received for an order"""
+        with self.lock:
+            return list(self.fills.get(order_id, []))
+
+def get_private_stream():
+    """Shared private stream (started on first use)"""
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            _stream = PrivateStream().start()
+    return _stream
+
+def stop_private_stream():
+    global _stream
+    with _stream_lock:
+        if _stream:
+            _stream.stop()
+        _stream = None
+
+def wait_order(order_id, timeout=BYBIT_ORDER_TIMEOUT):
+    """Wait for an order's final state on the private stream, falling back to the REST order history
+
+    Returns:
+        order dict ('orderStatus', 'cumExecQty', 'cumExecValue', 'avgPrice', ...)
+    """
+    from main.bybit.account.swap import get_order
+    future = get_private_stream().await_order(order_id)
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        future.cancel()
+        print(f"⚠️  Order {order_id} not final on the private stream after {timeout}s, querying REST")
+    order = get_order(order_id)
+    if not order or order["orderStatus"] not in FINAL_STATUSES:
+        raise ValueError(f"Order {order_id} not final: {order and order['orderStatus']}")
+    return order
+
+def wait_balance(coin, threshold, account_type="UNIFIED", timeout=BYBIT_ORDER_TIMEOUT):
+    """Wait until a UNIFIED wallet balance reaches threshold, falling back to one REST balance read
+
+    The wallet topic only covers the unified trading account; FUND balances need REST.
+    """
+    from main.bybit.account.balance import get_balance
+    future = get_private_stream().await_balance(coin, threshold, account_type)
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        future.cancel()
+    balance = get_balance(coin, account_type)
+    if balance < threshold:
+        raise ValueError(f"{coin} balance {balance} below {threshold:.6f} after {timeout}s")
+    return balance
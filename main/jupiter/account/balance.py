@@ -1,31 +1,61 @@
 """Jupiter/Solana balance operations"""
-from solders.pubkey import Pubkey
-from spl.token.instructions import get_associated_token_address
-from main.shared.data import get_token_info
-from ..helper.client import get_client, get_keypair
+from solders.account_decoder import UiAccountEncoding
+from solders.commitment_config import CommitmentLevel
+from solders.rpc.config import RpcAccountInfoConfig, RpcContextConfig, RpcTokenAccountsFilterProgramId
+from solders.rpc.requests import GetBalance, GetTokenAccountsByOwner
+from solders.rpc.responses import GetBalanceResp, GetTokenAccountsByOwnerJsonParsedResp
+from spl.token.constants import TOKEN_PROGRAM_ID
+from main.shared.data import get_token_info, mint_to_symbol
+from ..helper.client import get_client, get_wallet
 
 def get_sol_balance():
     """Get SOL balance"""
     client = get_client()
-    keypair = get_keypair()
-    balance_response = client.get_balance(keypair.pubkey())
+    balance_response = client.get_balance(get_wallet().pubkey)
     return balance_response.value / 1e9
 
+def get_all_balances():
+    """Get SOL and every SPL token balance of the wallet in one batched RPC request
+    
+    Token accounts are read with getTokenAccountsByOwner and mapped to symbols
+    via jupiter_bybit_overlap.json. Only the wallet's associated token account
+    of each mint is counted, since that is the account transfers and swaps
+    spend from. Wrapped SOL is not added to 'SOL', which stays the native balance.
+    
+    Returns:
+        dict of symbol -> balance (mints without a known symbol are left out)
+    """
+    wallet = get_wallet()
+    owner = wallet.pubkey
+    config = RpcAccountInfoConfig(encoding=UiAccountEncoding.JsonParsed, commitment=CommitmentLevel.Confirmed)
+    rpc_requests = (
+        GetBalance(owner, RpcContextConfig(commitment=CommitmentLevel.Confirmed), id=0),
+        GetTokenAccountsByOwner(owner, RpcTokenAccountsFilterProgramId(TOKEN_PROGRAM_ID), config, id=1)
+    )
+    parsers = (GetBalanceResp, GetTokenAccountsByOwnerJsonParsedResp)
+    responses = get_client().provider.make_batch_request(rpc_requests, parsers)
+    for response in responses:
+        if not hasattr(response, "value"):
+            raise ValueError(f"Balance RPC failed: {response}")
+    balances = {"SOL": responses[0].value / 1e9}
+    for keyed in responses[1].value:
+        info = keyed.account.data.parsed["info"]
+        symbol = mint_to_symbol(info["mint"])
+        if not symbol or symbol == "SOL" or keyed.pubkey != wallet.ata(info["mint"]):
+            continue
+        amount = info["tokenAmount"]
+        balances[symbol] = float(amount["amount"]) / (10 ** amount["decimals"])
+    return balances
+
 def get_token_balance(symbol):
-    """Get token balance for a specific symbol"""
-    if symbol.upper() == "SOL":
+    """Get token balance for a specific symbol (SOL errors raise, token errors read as 0)"""
+    symbol = symbol.upper()
+    if symbol == "SOL":
         return get_sol_balance()
-    token_info = get_token_info(symbol)
-    if not token_info:
+    if not get_token_info(symbol):
         raise ValueError(f"Token not found: {symbol}")
-    client = get_client()
-    keypair = get_keypair()
-    mint = Pubkey.from_string(token_info["mint"])
-    token_account = get_associated_token_address(keypair.pubkey(), mint)
     try:
-        response = client.get_token_account_balance(token_account)
-        balance = float(response.value.amount) / (10 ** token_info["decimals"])
-        return balance
+        return get_all_balances().get(symbol, 0.0)
     except Exception as e:
         print(f"Error getting balance for {symbol}: {e}")
         return 0.0
@@ -37,12 +67,9 @@ def check_balance(symbol):
 def has_ata(mint_address):
     """Check if wallet has Associated Token Account for a mint"""
     client = get_client()
-    keypair = get_keypair()
-    mint = Pubkey.from_string(mint_address)
-    ata = get_associated_token_address(keypair.pubkey(), mint)
+    ata = get_wallet().ata(mint_address)
     try:
         account_info = client.get_account_info(ata)
         return account_info.value is not None
     except:
         return False
-
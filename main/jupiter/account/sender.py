@@ -0,0 +1,103 @@
+"""Transaction sending with client-side rebroadcast until confirmation or blockhash expiry"""
+import time
+from collections import deque
+from concurrent.futures import TimeoutError
+from solana.rpc.commitment import Processed
+from solana.rpc.types import TxOpts
+from solders.message import Message, MessageV0
+from solders.signature import Signature
+from solders.transaction import Transaction, VersionedTransaction
+from main.shared.config import REBROADCAST_INTERVAL, MAX_RESIGNS, CONFIRM_TIMEOUT
+from ..helper.client import get_client, get_keypair
+from ..monitor.blockhash import get_blockhash_cache
+from ..monitor.confirmations import get_tracker
+
+# Recent sends: {'label', 'tx_sig', 'time_to_land', 'sends', 'resigns'}
+landing_log = deque(maxlen=1000)
+
+def resign(transaction, blockhash):
+    """Copy of a VersionedTransaction with a new blockhash, signed by the wallet keypair"""
+    m = transaction.message
+    message = MessageV0(m.header, m.account_keys, blockhash, m.instructions, m.address_table_lookups)
+    return VersionedTransaction(message, [get_keypair()])
+
+def legacy_builder(instructions):
+    """build function for send_transaction: a legacy transaction of instructions signed by the wallet"""
+    keypair = get_keypair()
+    def build(blockhash):
+        message = Message.new_with_blockhash(instructions, keypair.pubkey(), blockhash)
+        transaction = Transaction.new_unsigned(message)
+        transaction.sign([keypair], blockhash)
+        return transaction
+    return build
+
+def send_transaction(build, first=None, label="transaction", interval=REBROADCAST_INTERVAL, max_resigns=MAX_RESIGNS):
+    """Send a transaction and rebroadcast it until it confirms
+    
+    The first send runs preflight with RPC retries disabled (maxRetries=0); the same
+    signed bytes are then resent every `interval` seconds without preflight. Once the
+    block height passes the blockhash's last valid height the old transaction can no
+    longer land, so it is rebuilt with a fresh blockhash, up to max_resigns times.
+    
+    Args:
+        build: Function (blockhash) -> signed transaction
+        first: Optional (signed transaction, last_valid_block_height) to send before building
+        label: Name used in logs and landing_log
+    
+    Returns:
+        dict with 'tx_sig', 'confirmation' (see SignatureTracker), 'time_to_land'
+        (seconds from first send to confirmation), 'sends' and 'resigns'
+    """
+    client = get_client()
+    cache = get_blockhash_cache()
+    tracker = get_tracker()
+    if first:
+        transaction, last_valid_block_height = first
+    else:
+        blockhash, last_valid_block_height = cache.get_blockhash()
+        transaction = build(blockhash)
+    start = time.time()
+    sends = resigns = 0
+    while True:
+        raw = bytes(transaction)
+        tx_sig = str(client.send_raw_transaction(raw, opts=TxOpts(
+            skip_preflight=False, preflight_commitment=Processed, max_retries=0
+        )).value)
+        sends += 1
+        future = tracker.track(tx_sig)
+        while True:
+            try:
+                confirmation = future.result(interval)
+                break
+            except TimeoutError:
+                pass
+            if client.get_block_height().value > last_valid_block_height:
+                # The old transaction can no longer land: re-sign only if it has not already landed
+                # (the tracker may still be reading its metadata)
+                status = client.get_signature_statuses([Signature.from_string(tx_sig)]).value[0]
+                confirmation = None
+                if status:
+                    try:
+                        confirmation = future.result(CONFIRM_TIMEOUT)
+                    except TimeoutError:
+                        tracker.untrack(tx_sig)
+                        raise ValueError(f"{label} {tx_sig} landed ({status.confirmation_status}) but was not confirmed within {CONFIRM_TIMEOUT}s")
+                break
+            client.send_raw_transaction(raw, opts=TxOpts(skip_preflight=True, max_retries=0))
+            sends += 1
+        if confirmation:
+            break
+        tracker.untrack(tx_sig)
+        if resigns >= max_resigns:
+            raise ValueError(f"{label} {tx_sig} did not land before its blockhash expired ({resigns} re-signs)")
+        resigns += 1
+        print(f"⚠️  {label} {tx_sig} expired unconfirmed, re-signing with a fresh blockhash")
+        cache.refresh()
+        blockhash, last_valid_block_height = cache.get_blockhash()
+        transaction = build(blockhash)
+    if confirmation["err"]:
+        raise ValueError(f"{label} {tx_sig} failed: {confirmation['err']}")
+    time_to_land = time.time() - start
+    landing_log.append({"label": label, "tx_sig": tx_sig, "time_to_land": time_to_land, "sends": sends, "resigns": resigns})
+    print(f"⏱️  {label} landed in {time_to_land:.1f}s ({sends} sends, {resigns} re-signs)")
+    return {"tx_sig": tx_sig, "confirmation": confirmation, "time_to_land": time_to_land, "sends": sends, "resigns": resigns}
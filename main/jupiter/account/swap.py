@@ -2,32 +2,46 @@
 import base64
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from solders.instruction import AccountMeta, Instruction
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
 from solders.transaction import VersionedTransaction
-from solana.rpc.commitment import Processed
-from solana.rpc.types import TxOpts
+from main.shared.config import COMPUTE_UNIT_LIMITS, JUPITER_LOCAL_SWAP, QUOTE_CACHE_TTL
 from main.shared.data import get_token_info
-from ..helper.client import get_client, get_keypair
-from ..monitor.pricing import get_quote
+from main.shared.rate_limit import get_bucket, retry_after
+from ..helper.client import get_client, get_wallet
+from ..helper.lookup_tables import get_lookup_tables
+from ..monitor.blockhash import get_blockhash_cache
+from ..monitor.pricing import get_cached_quote
+from ..monitor.confirmations import confirm
+from .sender import send_transaction, resign
 from .balance import check_balance
 
+JUPITER_SWAP_INSTRUCTIONS_URL = "https://lite-api.jup.ag/swap/v1/swap-instructions"
+
+_prepare_pool = ThreadPoolExecutor(max_workers=2)
+
 def execute_swap(quote, priority_fee_lamports=None):
     """Execute swap with a quote"""
-    keypair = get_keypair()
-    client = get_client()
     swap_params = {
-        "quoteResponse": quote,
-        "userPublicKey": str(keypair.pubkey()),
+        "quoteResponse": _quote_response(quote),
+        "userPublicKey": get_wallet().address,
         "wrapAndUnwrapSol": True
     }
     if priority_fee_lamports is not None:
         swap_params["prioritizationFeeLamports"] = priority_fee_lamports
     
+    bucket = get_bucket("jupiter_swap")
     try:
+        bucket.wait()
         response = requests.post(
             "https://lite-api.jup.ag/swap/v1/swap",
             json=swap_params,
             timeout=15
         )
+        if response.status_code == 429:
+            bucket.backoff(retry_after(response.headers))
         if response.status_code != 200:
             raise ValueError(f"Jupiter swap API returned status {response.status_code}: {response.text[:200]}")
         
@@ -41,16 +55,141 @@ def execute_swap(quote, priority_fee_lamports=None):
     
     raw_tx = base64.b64decode(swap_tx["swapTransaction"])
     transaction = VersionedTransaction.from_bytes(raw_tx)
-    signed_tx = VersionedTransaction(transaction.message, [keypair])
-    result = client.send_raw_transaction(bytes(signed_tx), opts=TxOpts(
-        skip_preflight=False, preflight_commitment=Processed
-    ))
-    tx_sig = str(result.value)
+    # Signed with our cached blockhash so the sender knows when it expires
+    tx_sig = send_transaction(lambda blockhash: resign(transaction, blockhash), label="Jupiter swap")["tx_sig"]
     print(f"✅ Jupiter swap: https://solscan.io/tx/{tx_sig}")
     return tx_sig
 
-def swap(input_symbol, output_symbol, amount, slippage_bps=50):
-    """Swap tokens via Jupiter"""
+def get_swap_instructions(quote):
+    """Get the instructions of a swap from Jupiter instead of a ready-made transaction"""
+    bucket = get_bucket("jupiter_swap")
+    bucket.wait()
+    try:
+        response = requests.post(JUPITER_SWAP_INSTRUCTIONS_URL, json={
+            "quoteResponse": _quote_response(quote),
+            "userPublicKey": get_wallet().address,
+            "wrapAndUnwrapSol": True,
+            "dynamicComputeUnitLimit": True
+        }, timeout=15)
+    except requests.exceptions.RequestException as e:
+        raise ValueError(f"Jupiter swap-instructions request failed: {e}")
+    if response.status_code == 429:
+        bucket.backoff(retry_after(response.headers))
+    if response.status_code != 200:
+        raise ValueError(f"Jupiter swap-instructions API returned status {response.status_code}: {response.text[:200]}")
+    data = response.json()
+    if "swapInstruction" not in data:
+        raise ValueError(f"Jupiter swap-instructions response missing 'swapInstruction': {data.get('error', data)}")
+    return data
+
+def _to_instruction(ix):
+    accounts = [AccountMeta(Pubkey.from_string(a["pubkey"]), a["isSigner"], a["isWritable"]) for a in ix["accounts"]]
+    return Instruction(Pubkey.from_string(ix["programId"]), base64.b64decode(ix["data"]), accounts)
+
+def _simulated_cu_limit(data):
+    """Compute-unit limit Jupiter simulated for the swap, None if it sent none"""
+    for ix in data.get("computeBudgetInstructions", []):
+        raw = base64.b64decode(ix["data"])
+        if raw[0] == 2:
+            return int.from_bytes(raw[1:5], "little")
+    return None
+
+def prepare_swap(quote, cu_limit=None):
+    """Assemble and sign a swap transaction locally from Jupiter's swap instructions
+    
+    Jupiter's compute-budget instructions are replaced by our own: cu_limit (default
+    Jupiter's simulated limit plus 20%) and the cached priority fee. The blockhash
+    and address lookup tables come from the in-process caches.
+    
+    Returns:
+        dict with 'transaction' (signed VersionedTransaction), 'last_valid_block_height',
+        'quote' and 'created' (time.monotonic())
+    """
+    wallet = get_wallet()
+    data = get_swap_instructions(quote)
+    simulated = _simulated_cu_limit(data)
+    cu_limit = cu_limit or (int(simulated * 1.2) if simulated else COMPUTE_UNIT_LIMITS["swap"])
+    cache = get_blockhash_cache()
+    instructions = cache.compute_budget_instructions(cu_limit)
+    instructions += [_to_instruction(ix) for ix in data.get("setupInstructions", [])]
+    instructions.append(_to_instruction(data["swapInstruction"]))
+    if data.get("cleanupInstruction"):
+        instructions.append(_to_instruction(data["cleanupInstruction"]))
+    instructions += [_to_instruction(ix) for ix in data.get("otherInstructions", [])]
+    lookup_tables = get_lookup_tables(data.get("addressLookupTableAddresses", []))
+    blockhash, last_valid_block_height = cache.get_blockhash()
+    message = MessageV0.try_compile(wallet.pubkey, instructions, lookup_tables, blockhash)
+    return {
+        "transaction": VersionedTransaction(message, [wallet.keypair]),
+        "last_valid_block_height": last_valid_block_height,
+        "quote": quote,
+        "created": time.monotonic()
+    }
+
+def prepare_swap_in_background(quote, cu_limit=None):
+    """Run prepare_swap on a worker thread, returns a Future"""
+    return _prepare_pool.submit(prepare_swap, quote, cu_limit)
+
+def warm_swap(quote):
+    """Resolve the address lookup tables of a swap route into the cache
+    
+    A signed swap only stays sendable for one blockhash lifetime (~60-90s), and its
+    quote for QUOTE_CACHE_TTL, so neither survives a cross-venue deposit. What does
+    survive is the route's lookup tables; with them cached, building the real swap
+    later needs just a fresh quote, /swap-instructions and the cached blockhash.
+    
+    Returns:
+        list of lookup table addresses of the route
+    """
+    addresses = get_swap_instructions(quote).get("addressLookupTableAddresses", [])
+    get_lookup_tables(addresses)
+    return addresses
+
+def warm_swap_in_background(quote):
+    """Run warm_swap on a worker thread (e.g. while a withdrawal is in flight), returns a Future"""
+    return _prepare_pool.submit(warm_swap, quote)
+
+def send_prepared_swap(prepared):
+    """Send a transaction built by prepare_swap"""
+    transaction = prepared["transaction"]
+    tx_sig = send_transaction(lambda blockhash: resign(transaction, blockhash),
+                              first=(transaction, prepared["last_valid_block_height"]), label="Jupiter swap")["tx_sig"]
+    print(f"✅ Jupiter swap (local build): https://solscan.io/tx/{tx_sig}")
+    return tx_sig
+
+def _quote_response(quote):
+    """Quote as Jupiter sent it (without our 'fetched' stamp)"""
+    return {k: v for k, v in quote.items() if k != "fetched"}
+
+def _quote_matches(quote, input_mint, output_mint, amount_lamports, slippage_bps):
+    """Quote is for this pair and slippage and spends at most amount_lamports"""
+    return bool(quote) and quote.get("inputMint") == input_mint and quote.get("outputMint") == output_mint \
+        and int(quote["inAmount"]) <= amount_lamports and quote.get("slippageBps") == slippage_bps
+
+def _quote_usable(quote, input_mint, output_mint, amount_lamports, slippage_bps):
+    """Quote matches and was fetched within QUOTE_CACHE_TTL"""
+    return _quote_matches(quote, input_mint, output_mint, amount_lamports, slippage_bps) \
+        and time.monotonic() - quote.get("fetched", 0) <= QUOTE_CACHE_TTL
+
+def _prepared_usable(prepared, input_mint, output_mint, amount_lamports, slippage_bps):
+    """Prepared swap matches and its blockhash has not expired yet"""
+    return _quote_matches(prepared["quote"], input_mint, output_mint, amount_lamports, slippage_bps) \
+        and get_client().get_block_height().value <= prepared["last_valid_block_height"]
+
+def swap(input_symbol, output_symbol, amount, slippage_bps=50, quote=None, local=JUPITER_LOCAL_SWAP, prepared=None):
+    """Swap tokens via Jupiter and wait until the transaction is confirmed
+    
+    Returns:
+        dict with 'tx_sig', 'expected_amount', 'received' (actual output from the
+        transaction metadata, None if unavailable) and 'confirmation'
+    
+    quote: Fresh quote to execute directly (e.g. from the check step). Ignored if it is
+           for another pair or slippage_bps, spends more than amount or is older than
+           QUOTE_CACHE_TTL; a cached or new quote is used then.
+    local: Build the transaction locally (prepare_swap) instead of via Jupiter's /swap
+    prepared: Result of prepare_swap, sent as is if it matches the pair, slippage and amount and
+              its blockhash is still valid, otherwise the swap is rebuilt
+    """
     input_info = get_token_info(input_symbol)
     output_info = get_token_info(output_symbol)
     if not input_info:
@@ -60,33 +199,46 @@ def swap(input_symbol, output_symbol, amount, slippage_bps=50):
     input_mint = input_info["mint"]
     output_mint = output_info["mint"]
     amount_lamports = int(amount * (10 ** input_info["decimals"]))
-    quote = get_quote(input_mint, output_mint, amount_lamports, slippage_bps)
+    if prepared and _prepared_usable(prepared, input_mint, output_mint, amount_lamports, slippage_bps):
+        quote = prepared["quote"]
+    else:
+        prepared = None
+        if not _quote_usable(quote, input_mint, output_mint, amount_lamports, slippage_bps):
+            quote = get_cached_quote(input_mint, output_mint, amount_lamports, slippage_bps)
     if not quote:
         raise ValueError("Failed to get quote from Jupiter")
     expected_out = float(quote.get("outAmount", 0)) / (10 ** output_info["decimals"])
     print(f"🔄 Swapping {input_symbol} → {output_symbol}: {amount}")
     print(f"📊 Expected to receive: ~{expected_out:.6f} {output_symbol}")
-    tx_sig = execute_swap(quote)
-    return {"tx_sig": tx_sig, "expected_amount": expected_out}
+    if prepared:
+        tx_sig = send_prepared_swap(prepared)
+    elif local:
+        tx_sig = send_prepared_swap(prepare_swap(quote))
+    else:
+        tx_sig = execute_swap(quote)
+    confirmation = confirm(tx_sig)
+    received = (confirmation["deltas"] or {}).get(output_symbol.upper())
+    print(f"✅ Swap confirmed in {confirmation['elapsed']:.1f}s" + (f", received {received:.6f} {output_symbol}" if received is not None else ""))
+    return {"tx_sig": tx_sig, "expected_amount": expected_out, "received": received, "confirmation": confirmation}
 
-def crypto_to_u(crypto, slippage_bps=100000):
+def crypto_to_u(crypto, slippage_bps=100000, quote=None, local=JUPITER_LOCAL_SWAP, prepared=None):
     """Swap all crypto balance to USDT"""
     balance = check_balance(crypto)
     if balance <= 0:
         raise ValueError(f"No {crypto} balance to swap")
     
     print(f"💰 {crypto} balance: {balance}")
-    return swap(crypto, "USDT", balance, slippage_bps)
+    return swap(crypto, "USDT", balance, slippage_bps, quote, local, prepared)
 
-def u_to_crypto(crypto, slippage_bps=50):
+def u_to_crypto(crypto, slippage_bps=50, quote=None, local=JUPITER_LOCAL_SWAP, prepared=None):
     """Swap all USDT to target crypto
     
     Returns:
-        dict with 'tx_sig' and 'expected_amount'
+        dict with 'tx_sig', 'expected_amount', 'received' and 'confirmation'
     """
     balance = check_balance("USDT")
     if balance <= 0:
         raise ValueError("No USDT balance to swap")
     print(f"💰 USDT balance: {balance}")
-    return swap("USDT", crypto, balance, slippage_bps)
+    return swap("USDT", crypto, balance, slippage_bps, quote, local, prepared)
 
@@ -1,22 +1,22 @@
 """Jupiter/Solana transfer operations"""
 from solders.pubkey import Pubkey
-from solders.transaction import Transaction
 from solders.system_program import TransferParams, transfer
-from solders.message import Message
-from solana.rpc.commitment import Processed
-from solana.rpc.types import TxOpts
 from spl.token.instructions import transfer_checked, TransferCheckedParams, get_associated_token_address, create_associated_token_account
 from spl.token.constants import TOKEN_PROGRAM_ID
-from ..helper.client import get_client, get_keypair
-from .balance import get_sol_balance, get_token_balance
+from ..helper.client import get_client, get_wallet
+from ..helper.ata_cache import ata_exists, remember_ata, forget_ata
+from .balance import get_sol_balance, get_all_balances
+from ..monitor.confirmations import confirm
+from ..monitor.blockhash import get_blockhash_cache
+from .sender import send_transaction, legacy_builder
+from main.shared.config import COMPUTE_UNIT_LIMITS
 from main.shared.data import get_token_info
 from main.bybit.account.transfers import get_deposit_address
 import time
 
 def send_sol(destination, amount):
     """Send native SOL to a destination"""
-    keypair = get_keypair()
-    client = get_client()
+    wallet = get_wallet()
     balance = get_sol_balance()
     required = amount + 0.00001
     if balance < required:
@@ -24,51 +24,39 @@ def send_sol(destination, amount):
     dest_pubkey = Pubkey.from_string(destination)
     lamports = int(amount * 1e9)
     transfer_ix = transfer(TransferParams(
-        from_pubkey=keypair.pubkey(),
+        from_pubkey=wallet.pubkey,
         to_pubkey=dest_pubkey,
         lamports=lamports
     ))
-    recent_blockhash = client.get_latest_blockhash().value.blockhash
-    message = Message.new_with_blockhash([transfer_ix], keypair.pubkey(), recent_blockhash)
-    transaction = Transaction.new_unsigned(message)
-    transaction.sign([keypair], recent_blockhash)
-    result = client.send_transaction(transaction, opts=TxOpts(
-        skip_preflight=False, preflight_commitment=Processed
-    ))
-    tx_sig = str(result.value)
+    cache = get_blockhash_cache()
+    instructions = cache.compute_budget_instructions(COMPUTE_UNIT_LIMITS["sol_transfer"]) + [transfer_ix]
+    tx_sig = send_transaction(legacy_builder(instructions), label="SOL transfer")["tx_sig"]
     print(f"✅ SOL transfer: https://solscan.io/tx/{tx_sig}")
     return tx_sig
 
 def send_token(mint_address, destination, amount, decimals):
     """Send SPL token to a destination"""
-    keypair = get_keypair()
+    wallet = get_wallet()
     client = get_client()
     mint_pubkey = Pubkey.from_string(mint_address)
     dest_pubkey = Pubkey.from_string(destination)
-    source_ata = get_associated_token_address(keypair.pubkey(), mint_pubkey)
+    source_ata = wallet.ata(mint_address)
     dest_ata = get_associated_token_address(dest_pubkey, mint_pubkey)
     
     instructions = []
     
-    # Check if destination ATA exists, create if not
-    try:
-        account_info = client.get_account_info(dest_ata)
-        if account_info.value is None:
+    # Known destination ATAs skip the lookup; otherwise check on chain and create if missing
+    if not ata_exists(destination, mint_address):
+        if client.get_account_info(dest_ata).value is None:
             print(f"📦 Creating ATA for destination...")
             create_ata_ix = create_associated_token_account(
-                payer=keypair.pubkey(),
+                payer=wallet.pubkey,
                 owner=dest_pubkey,
                 mint=mint_pubkey
             )
             instructions.append(create_ata_ix)
-    except:
-        print(f"📦 Creating ATA for destination...")
-        create_ata_ix = create_associated_token_account(
-            payer=keypair.pubkey(),
-            owner=dest_pubkey,
-            mint=mint_pubkey
-        )
-        instructions.append(create_ata_ix)
+        else:
+            remember_ata(destination, mint_address)
     
     amount_lamports = int(amount * (10 ** decimals))
     transfer_ix = transfer_checked(TransferCheckedParams(
@@ -76,20 +64,21 @@ def send_token(mint_address, destination, amount, decimals):
         source=source_ata,
         mint=mint_pubkey,
         dest=dest_ata,
-        owner=keypair.pubkey(),
+        owner=wallet.pubkey,
         amount=amount_lamports,
         decimals=decimals
     ))
     instructions.append(transfer_ix)
     
-    recent_blockhash = client.get_latest_blockhash().value.blockhash
-    message = Message.new_with_blockhash(instructions, keypair.pubkey(), recent_blockhash)
-    transaction = Transaction.new_unsigned(message)
-    transaction.sign([keypair], recent_blockhash)
-    result = client.send_transaction(transaction, opts=TxOpts(
-        skip_preflight=False, preflight_commitment=Processed
-    ))
-    tx_sig = str(result.value)
+    cache = get_blockhash_cache()
+    cu_limit = COMPUTE_UNIT_LIMITS["token_transfer"] + COMPUTE_UNIT_LIMITS["create_ata"] * (len(instructions) - 1)
+    instructions = cache.compute_budget_instructions(cu_limit) + instructions
+    try:
+        tx_sig = send_transaction(legacy_builder(instructions), label="Token transfer")["tx_sig"]
+    except Exception:
+        forget_ata(destination, mint_address)
+        raise
+    remember_ata(destination, mint_address)
     print(f"✅ Token transfer: https://solscan.io/tx/{tx_sig}")
     return tx_sig
 
@@ -98,7 +87,8 @@ def withdraw(symbol, chain="SOL"):
     coin = symbol.upper()
     print(f"🔄 Starting withdrawal from Jupiter to Bybit for {coin}...")
     
-    balance = get_token_balance(coin)
+    balances = get_all_balances()
+    balance = balances.get(coin, 0.0)
     if balance <= 0:
         print(f"❌ No {coin} available in Jupiter wallet")
         return None
@@ -115,7 +105,7 @@ def withdraw(symbol, chain="SOL"):
         print(f"💰 Withdrawing {withdrawal_amount} SOL (reserving {fee_reserve} SOL for fees)")
     else:
         withdrawal_amount = balance
-        sol_balance = get_sol_balance()
+        sol_balance = balances.get("SOL", 0.0)
         if sol_balance < 0.001:
             print(f"⚠️  Warning: Low SOL balance ({sol_balance}). May not have enough for transaction fees")
     
@@ -142,13 +132,15 @@ def withdraw(symbol, chain="SOL"):
                 token_info["decimals"]
             )
         
-        print(f"✅ Successfully withdrew {withdrawal_amount} {coin} to Bybit")
+        confirmation = confirm(tx_sig)
+        print(f"✅ Successfully withdrew {withdrawal_amount} {coin} to Bybit (confirmed in {confirmation['elapsed']:.1f}s)")
         return {
             "coin": coin,
             "balance": balance,
             "amount": withdrawal_amount,
             "address": bybit_address,
-            "tx_sig": tx_sig
+            "tx_sig": tx_sig,
+            "confirmation": confirmation
         }
     except Exception as e:
         print(f"❌ Withdrawal failed: {e}")
@@ -0,0 +1,45 @@
+"""Persistent cache of destination token accounts known to exist"""
+import json
+import os
+import threading
+from main.shared.config import ATA_CACHE_PATH
+
+_known = None
+_lock = threading.Lock()
+
+def _load():
+    global _known
+    if _known is None:
+        try:
+            with open(ATA_CACHE_PATH, encoding="utf-8") as f:
+                _known = set(json.load(f))
+        except (FileNotFoundError, ValueError):
+            _known = set()
+    return _known
+
+def _save():
+    tmp_path = ATA_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(sorted(_known), f, indent=2)
+    os.replace(tmp_path, ATA_CACHE_PATH)
+
+def ata_exists(owner, mint):
+    """True if the (owner, mint) token account was seen on chain before"""
+    with _lock:
+        return f"{owner}:{mint}" in _load()
+
+def remember_ata(owner, mint):
+    """Record an existing (owner, mint) token account"""
+    with _lock:
+        known = _load()
+        if f"{owner}:{mint}" not in known:
+            known.add(f"{owner}:{mint}")
+            _save()
+
+def forget_ata(owner, mint):
+    """Drop an entry, e.g. after a transfer to it failed (the account may have been closed)"""
+    with _lock:
+        known = _load()
+        if f"{owner}:{mint}" in known:
+            known.discard(f"{owner}:{mint}")
+            _save()
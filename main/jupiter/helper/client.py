@@ -1,24 +1,60 @@
 """Solana client and keypair management"""
-from solana.rpc.api import Client
-from solders.keypair import Keypair
+import json
+from solana.rpc.commitment import Confirmed
 from solders.pubkey import Pubkey
-from main.shared.config import get_solana_keypair, SOLANA_RPC_URL
+from spl.token.instructions import get_associated_token_address
+from main.shared.config import get_solana_keypair, SOLANA_RPC_URLS
+from main.shared.data import load_overlap_data
+from main.jupiter.helper.rpc_pool import RpcPool, PooledClient
 
 _client_instance = None
+_wallet = None
+
+class Wallet:
+    """Wallet keypair parsed once, with its pubkey and the ATA of every overlap mint precomputed"""
+
+    def __init__(self, keypair):
+        self.keypair = keypair
+        self.pubkey = keypair.pubkey()
+        self.address = str(self.pubkey)
+        self.atas = {}
+        for item in load_overlap_data().values():
+            self.ata(item["contractAddress"])
+
+    def ata(self, mint_address):
+        """Associated token account of the wallet for a mint (mints outside the overlap data are cached on first use)"""
+        ata = self.atas.get(mint_address)
+        if ata is None:
+            ata = self.atas[mint_address] = get_associated_token_address(self.pubkey, Pubkey.from_string(mint_address))
+        return ata
 
 def get_client():
-    """Get Solana RPC client (cached singleton)"""
+    """Get Solana RPC client (cached singleton, calls go through the SOLANA_RPC_URLS pool)"""
     global _client_instance
     if _client_instance is None:
-        _client_instance = Client(SOLANA_RPC_URL)
+        _client_instance = PooledClient(RpcPool(SOLANA_RPC_URLS), commitment=Confirmed)
     return _client_instance
 
+def rpc_request(method, params=None):
+    """Raw JSON-RPC call over the shared client's pool (for methods solana-py does not wrap)"""
+    content = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []})
+    data = json.loads(get_client().pool.request(content, {"Content-Type": "application/json"}))
+    if "error" in data:
+        raise ValueError(f"RPC {method} failed: {data['error']}")
+    return data["result"]
+
+def get_wallet():
+    """Get wallet context (cached singleton, keypair read from environment once)"""
+    global _wallet
+    if _wallet is None:
+        _wallet = Wallet(get_solana_keypair())
+    return _wallet
+
 def get_keypair():
-    """Get Solana keypair from environment"""
-    return get_solana_keypair()
+    """Get Solana keypair"""
+    return get_wallet().keypair
 
 def get_address():
     """Get Solana wallet address"""
-    keypair = get_keypair()
-    return str(keypair.pubkey())
+    return get_wallet().address
 
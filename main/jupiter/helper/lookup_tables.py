@@ -0,0 +1,32 @@
+"""Address lookup table cache for locally compiled v0 transactions"""
+import threading
+import time
+from solders.address_lookup_table_account import AddressLookupTable, AddressLookupTableAccount
+from solders.pubkey import Pubkey
+from main.shared.config import LOOKUP_TABLE_TTL
+from .client import get_client
+
+_tables = {}
+_lock = threading.Lock()
+
+def get_lookup_tables(addresses, ttl=LOOKUP_TABLE_TTL):
+    """Resolve lookup table addresses to AddressLookupTableAccounts
+    
+    Tables cached less than ttl seconds ago are reused; the rest are fetched with
+    one getMultipleAccounts per 100 tables. Tables are append-only, so a cached
+    copy stays valid and at worst misses addresses added since.
+    """
+    now = time.monotonic()
+    with _lock:
+        missing = [a for a in dict.fromkeys(addresses) if a not in _tables or now - _tables[a][0] > ttl]
+    for i in range(0, len(missing), 100):
+        batch = missing[i:i + 100]
+        accounts = get_client().get_multiple_accounts([Pubkey.from_string(a) for a in batch]).value
+        for address, account in zip(batch, accounts):
+            if account is None:
+                raise ValueError(f"Address lookup table not found: {address}")
+            table = AddressLookupTable.deserialize(bytes(account.data))
+            with _lock:
+                _tables[address] = (now, AddressLookupTableAccount(Pubkey.from_string(address), list(table.addresses)))
+    with _lock:
+        return [_tables[a][1] for a in addresses]
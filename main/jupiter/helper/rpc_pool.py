@@ -0,0 +1,147 @@
+"""Solana RPC endpoint pool with latency-based routing and hedged reads"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import httpx
+from solana.rpc.api import Client
+from solana.rpc.providers.http import HTTPProvider
+from main.shared.config import RPC_HEDGE_AFTER, RPC_EWMA_ALPHA
+from main.shared.rate_limit import get_bucket, retry_after
+
+# Never duplicated to a second endpoint
+WRITE_METHODS = ("sendTransaction", "requestAirdrop")
+
+def _throttle(request):
+    get_bucket("solana_rpc").wait()
+
+def _govern(response):
+    if response.status_code == 429:
+        get_bucket("solana_rpc").backoff(retry_after(response.headers))
+
+class Endpoint:
+    """One RPC URL with its own connection pool and EWMA latency / error rate"""
+
+    def __init__(self, url, alpha=RPC_EWMA_ALPHA, timeout=10, cooldown=5):
+        self.url = url
+        self.alpha = alpha
+        self.cooldown = cooldown
+        self.session = httpx.Client(timeout=timeout, event_hooks={"request": [_throttle], "response": [_govern]})
+        self.latency = None
+        self.error_rate = 0.0
+        self.cooldown_until = 0
+        self.lock = threading.Lock()
+
+    def record(self, elapsed, ok):
+        with self.lock:
+            self.latency = elapsed if self.latency is None else self.alpha * elapsed + (1 - self.alpha) * self.latency
+            self.error_rate = self.alpha * (0 if ok else 1) + (1 - self.alpha) * self.error_rate
+
+    def healthy(self):
+        return time.monotonic() >= self.cooldown_until
+
+    def score(self):
+        """Expected latency inflated by the error rate (unmeasured endpoints score 0 so they get tried)"""
+        return (self.latency or 0) * (1 + 4 * self.error_rate)
+
+    def post(self, content, headers):
+        """POST a JSON-RPC payload, returns the response text; 429/5xx count as errors"""
+        start = time.monotonic()
+        try:
+            response = self.session.post(self.url, content=content, headers=headers)
+            if response.status_code == 429:
+                self.cooldown_until = time.monotonic() + (retry_after(response.headers) or self.cooldown)
+            response.raise_for_status()
+        except Exception:
+            self.record(time.monotonic() - start, False)
+            # Sit out a while, then rejoin the ranking with the error penalty still in the score
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + self.cooldown)
+            raise
+        self.record(time.monotonic() - start, True)
+        return response.text
+
+class RpcPool:
+    """Routes each call to the fastest healthy endpoint, failing over down the ranking
+
+    Reads (everything but WRITE_METHODS) are hedged: if the first endpoint has not
+    answered after hedge_after seconds the same request goes to the second one and
+    the first successful answer wins. Both answers still update the averages.
+    """
+
+    def __init__(self, urls, hedge_after=RPC_HEDGE_AFTER, alpha=RPC_EWMA_ALPHA, timeout=10):
+        self.endpoints = [Endpoint(url, alpha, timeout) for url in urls]
+        self.hedge_after = hedge_after
+        self.executor = ThreadPoolExecutor(max_workers=8)
+
+    def ranked(self):
+        """Healthy endpoints by score, then unhealthy ones by score"""
+        return sorted(self.endpoints, key=lambda e: (not e.healthy(), e.score()))
+
+    def request(self, content, headers, hedge=True):
+        """Send a JSON-RPC payload, returns the response text of the first endpoint that answers"""
+        order = self.ranked()
+        if hedge and self.hedge_after is not None and len(order) > 1:
+            return self._hedged(content, headers, order)
+        return self._failover(content, headers, order)
+
+    def _failover(self, content, headers, order, error=None):
+        for endpoint in order:
+            try:
+                return endpoint.post(content, headers)
+            except Exception as e:
+                error = e
+        raise error
+
+    def _hedged(self, content, headers, order):
+        futures = [self.executor.submit(order[0].post, content, headers)]
+        done, _ = wait(futures, self.hedge_after)
+        if not done:
+            futures.append(self.executor.submit(order[1].post, content, headers))
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        # Every hedged attempt failed, walk the endpoints not tried yet
+        return self._failover(content, headers, order[len(futures):], futures[0].exception())
+
+    def stats(self):
+        """{url: {'latency', 'error_rate', 'healthy'}} for monitoring"""
+        return {e.url: {"latency": e.latency, "error_rate": e.error_rate, "healthy": e.healthy()} for e in self.endpoints}
+
+class PooledProvider(HTTPProvider):
+    """solana-py HTTP provider that sends through an RpcPool instead of one endpoint"""
+
+    def __init__(self, pool):
+        super().__init__(pool.endpoints[0].url)
+        self.pool = pool
+
+    def make_request_unparsed(self, body):
+        kwargs = self._before_request(body=body)
+        method = json.loads(kwargs["content"])["method"]
+        return self.pool.request(kwargs["content"], kwargs["headers"], hedge=method not in WRITE_METHODS)
+
+    def make_batch_request_unparsed(self, reqs):
+        kwargs = self._before_batch_request(reqs)
+        return self.pool.request(kwargs["content"], kwargs["headers"])
+
+class PooledClient(Client):
+    """solana-py Client whose calls all go through an RpcPool
+
+    Client builds a single-endpoint HTTPProvider in its constructor; this one
+    swaps in a PooledProvider right after, and refuses to start if a solana-py
+    upgrade stops keeping the provider there, instead of silently bypassing the pool.
+    """
+
+    def __init__(self, pool, commitment=None):
+        super().__init__(pool.endpoints[0].url, commitment)
+        if not isinstance(getattr(self, "_provider", None), HTTPProvider):
+            raise TypeError("solana.rpc.api.Client no longer holds an HTTPProvider in _provider; update PooledClient")
+        self._provider = PooledProvider(pool)
+        self.pool = pool
+
+    @property
+    def provider(self):
+        """The PooledProvider every call is sent through (for batch requests)"""
+        return self._provider
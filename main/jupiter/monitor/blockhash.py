@@ -0,0 +1,91 @@
+"""Background cache of the latest blockhash and a priority-fee estimate for Solana sends"""
+import threading
+import time
+import numpy as np
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from main.shared.config import (
+    BLOCKHASH_REFRESH_INTERVAL, PRIORITY_FEE_REFRESH_INTERVAL, PRIORITY_FEE_PERCENTILE, PRIORITY_FEE_RANGE
+)
+from ..helper.client import get_client, rpc_request
+
+_cache = None
+_cache_lock = threading.Lock()
+
+class BlockhashCache:
+    """Keeps a recent blockhash, its last valid block height and a compute-unit price warm
+
+    A daemon thread refreshes the blockhash every `interval` seconds and samples
+    getRecentPrioritizationFees every `fee_interval` seconds. Readers never wait
+    on the RPC unless the cached blockhash is older than max_age (refresher down).
+    """
+
+    def __init__(self, client=None, interval=BLOCKHASH_REFRESH_INTERVAL, fee_interval=PRIORITY_FEE_REFRESH_INTERVAL):
+        self.client = client or get_client()
+        self.interval = interval
+        self.fee_interval = fee_interval
+        self.blockhash = None
+        self.last_valid_block_height = None
+        self.updated = 0
+        self.priority_fee = PRIORITY_FEE_RANGE[0]
+        self.fee_updated = 0
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            try:
+                self.refresh()
+                if time.monotonic() - self.fee_updated > self.fee_interval:
+                    self.refresh_priority_fee()
+            except Exception as e:
+                print(f"⚠️  Blockhash refresh failed: {e}")
+            time.sleep(self.interval)
+
+    def refresh(self):
+        """Fetch the latest blockhash"""
+        value = self.client.get_latest_blockhash().value
+        with self.lock:
+            self.blockhash, self.last_valid_block_height = value.blockhash, value.last_valid_block_height
+            self.updated = time.monotonic()
+
+    def refresh_priority_fee(self):
+        """Set the compute-unit price to a percentile of recent prioritization fees, clamped to PRIORITY_FEE_RANGE"""
+        fees = [item["prioritizationFee"] for item in rpc_request("getRecentPrioritizationFees")]
+        if fees:
+            self.priority_fee = int(np.clip(np.percentile(fees, PRIORITY_FEE_PERCENTILE), *PRIORITY_FEE_RANGE))
+        self.fee_updated = time.monotonic()
+        return self.priority_fee
+
+    def get_blockhash(self, max_age=20):
+        """(blockhash, last_valid_block_height), refreshed synchronously only if older than max_age seconds"""
+        if time.monotonic() - self.updated > max_age:
+            self.refresh()
+        with self.lock:
+            return self.blockhash, self.last_valid_block_height
+
+    def compute_budget_instructions(self, cu_limit):
+        """Compute-unit limit and price instructions to prepend to a transaction"""
+        return [set_compute_unit_limit(cu_limit), set_compute_unit_price(self.priority_fee)]
+
+def get_blockhash_cache():
+    """Shared cache, started on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BlockhashCache().start()
+    return _cache
+
+def stop_blockhash_cache():
+    global _cache
+    with _cache_lock:
+        if _cache:
+            _cache.stop()
+        _cache = None
@@ -0,0 +1,238 @@
+"""Solana transaction confirmation by signature (WebSocket subscription with status polling fallback)"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import websocket
+from solana.rpc.commitment import Confirmed
+from solders.signature import Signature
+from main.shared.config import SOLANA_WS_URL, CONFIRM_TIMEOUT
+from main.shared.data import mint_to_symbol
+from ..helper.client import get_client, get_address
+
+# Ordered like TransactionConfirmationStatus (int() gives the index)
+COMMITMENTS = ["processed", "confirmed", "finalized"]
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+class SignatureTracker:
+    """Resolves a Future per signature once it reaches the requested commitment
+
+    Each tracked signature gets a signatureSubscribe on the RPC WebSocket. A
+    poller also batches every pending signature into getSignatureStatuses
+    (every 2s while the socket is up, every poll_interval while it is down),
+    which covers dropped notifications and transactions that landed before
+    the subscription. Results carry the wallet's balance changes read from
+    the transaction metadata and are kept for recent signatures, so tracking
+    an already confirmed signature returns at once.
+    """
+
+    def __init__(self, ws_url=SOLANA_WS_URL, client=None, owner=None, poll_interval=0.5):
+        self.ws_url = ws_url
+        self.client = client or get_client()
+        self.owner = owner or get_address()
+        self.poll_interval = poll_interval
+        self.pending = {}
+        self.resolved = OrderedDict()
+        self.subscriptions = {}
+        self.requests = {}
+        self.next_id = 1
+        self.lock = threading.Lock()
+        self.ws = None
+        self.connected = False
+        self.running = False
+        self.pool = ThreadPoolExecutor(max_workers=4)
+
+    def start(self):
+        """Connect and poll in background threads"""
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+        threading.Thread(target=self._poll, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.ws:
+            self.ws.close()
+
+    def track(self, signature, commitment="confirmed"):
+        """Start tracking a signature, returns a Future of the confirmation dict (see _resolve)"""
+        signature = str(signature)
+        with self.lock:
+            if signature in self.resolved:
+                future = Future()
+                future.set_result(self.resolved[signature])
+                return future
+            entry = self.pending.get(signature)
+            if entry is None:
+                entry = self.pending[signature] = {"future": Future(), "commitment": commitment, "start": time.time()}
+        if self.connected:
+            self._subscribe(signature, commitment)
+        return entry["future"]
+
+    def untrack(self, signature):
+        """Stop tracking a signature (e.g. one whose blockhash expired)"""
+        with self.lock:
+            self.pending.pop(str(signature), None)
+
+    def wait(self, signature, commitment="confirmed", timeout=CONFIRM_TIMEOUT):
+        """Block until a signature reaches commitment, raises ValueError if it failed or timed out"""
+        future = self.track(signature, commitment)
+        try:
+            result = future.result(timeout)
+        except TimeoutError:
+            self.untrack(signature)
+            raise ValueError(f"Transaction {signature} not {commitment} after {timeout}s")
+        if result["err"]:
+            raise ValueError(f"Transaction {signature} failed: {result['err']}")
+        return result
+
+    def _run(self):
+        while self.running:
+            self.ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.handle_message(json.loads(message))
+            )
+            self.ws.run_forever(ping_interval=30)
+            # Handled here rather than as on_close so every disconnect (also errors) is handled exactly once
+            self._on_close(self.ws, None, None)
+            if self.running:
+                time.sleep(1)
+
+    def _on_open(self, ws):
+        self.connected = True
+        with self.lock:
+            pending = [(sig, entry["commitment"]) for sig, entry in self.pending.items()]
+        for signature, commitment in pending:
+            self._subscribe(signature, commitment)
+
+    def _on_close(self, ws, status, message):
+        self.connected = False
+        with self.lock:
+            self.subscriptions.clear()
+            self.requests.clear()
+
+    def _subscribe(self, signature, commitment):
+        with self.lock:
+            request_id = self.next_id
+            self.next_id += 1
+            self.requests[request_id] = signature
+        try:
+            self.ws.send(json.dumps({
+                "jsonrpc": "2.0", "id": request_id, "method": "signatureSubscribe",
+                "params": [signature, {"commitment": commitment}]
+            }))
+        except Exception as e:
+            print(f"⚠️  signatureSubscribe failed, falling back to polling: {e}")
+
+    def handle_message(self, message):
+        """Apply one WebSocket message (subscription ack or signatureNotification)"""
+        if "id" in message:
+            with self.lock:
+                signature = self.requests.pop(message["id"], None)
+                if signature and "result" in message:
+                    self.subscriptions[message["result"]] = signature
+            return
+        if message.get("method") != "signatureNotification":
+            return
+        params = message["params"]
+        with self.lock:
+            signature = self.subscriptions.pop(params["subscription"], None)
+        value = params["result"]["value"]
+        if signature and isinstance(value, dict):
+            self._resolve(signature, params["result"]["context"]["slot"], value.get("err"))
+
+    def _poll(self):
+        while self.running:
+            time.sleep(2 if self.connected else self.poll_interval)
+            with self.lock:
+                pending = {sig: entry["commitment"] for sig, entry in self.pending.items()}
+            signatures = list(pending)
+            for i in range(0, len(signatures), 256):
+                batch = signatures[i:i + 256]
+                try:
+                    statuses = self.client.get_signature_statuses([Signature.from_string(s) for s in batch]).value
+                except Exception as e:
+                    print(f"⚠️  getSignatureStatuses failed: {e}")
+                    continue
+                for signature, status in zip(batch, statuses):
+                    if status is None or status.confirmation_status is None:
+                        continue
+                    if status.err or int(status.confirmation_status) >= COMMITMENTS.index(pending[signature]):
+                        self._resolve(signature, status.slot, status.err)
+
+    def _resolve(self, signature, slot, err):
+        """Hand a landed signature to the pool, which reads its balance changes and sets the Future:
+
+        {'signature', 'slot', 'err' (None on success), 'commitment', 'elapsed' (seconds since track),
+         'deltas' (symbol or mint -> change in the wallet's balance, None if the transaction could not be read)}
+        """
+        with self.lock:
+            entry = self.pending.pop(signature, None)
+        if entry is None:
+            return
+        result = {"signature": signature, "slot": slot, "err": err and str(err),
+                  "commitment": entry["commitment"], "elapsed": time.time() - entry["start"]}
+        def finish():
+            result["deltas"] = self.get_deltas(signature)
+            with self.lock:
+                self.resolved[signature] = result
+                while len(self.resolved) > 1000:
+                    self.resolved.popitem(last=False)
+            entry["future"].set_result(result)
+        self.pool.submit(finish)
+
+    def get_deltas(self, signature, attempts=5):
+        """Wallet balance changes of a transaction from its metadata (SOL net of fees)"""
+        for attempt in range(attempts):
+            try:
+                tx = self.client.get_transaction(Signature.from_string(signature), encoding="jsonParsed",
+                                                 commitment=Confirmed, max_supported_transaction_version=0).value
+            except Exception as e:
+                print(f"⚠️  getTransaction failed for {signature}: {e}")
+                tx = None
+            if tx is not None:
+                return self._parse_deltas(tx.transaction)
+            time.sleep(0.5)
+        return None
+
+    def _parse_deltas(self, tx):
+        meta = tx.meta
+        keys = [str(key.pubkey) for key in tx.transaction.message.account_keys]
+        deltas = {}
+        if self.owner in keys:
+            i = keys.index(self.owner)
+            deltas["SOL"] = (meta.post_balances[i] - meta.pre_balances[i]) / 1e9
+        for sign, balances in ((-1, meta.pre_token_balances), (1, meta.post_token_balances)):
+            for balance in balances or []:
+                if str(balance.owner) != self.owner:
+                    continue
+                mint = str(balance.mint)
+                symbol = mint_to_symbol(mint) or mint
+                if symbol == "SOL":
+                    symbol = "WSOL"
+                amount = balance.ui_token_amount
+                deltas[symbol] = deltas.get(symbol, 0.0) + sign * int(amount.amount) / (10 ** amount.decimals)
+        return deltas
+
+def get_tracker():
+    """Shared tracker, started on first use"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = SignatureTracker().start()
+    return _tracker
+
+def stop_tracker():
+    global _tracker
+    with _tracker_lock:
+        if _tracker:
+            _tracker.stop()
+        _tracker = None
+
+def confirm(signature, commitment="confirmed", timeout=CONFIRM_TIMEOUT):
+    """Wait for a signature on the shared tracker (see SignatureTracker.wait)"""
+    return get_tracker().wait(signature, commitment, timeout)
@@ -1,25 +1,201 @@
 """Jupiter pricing and quotes"""
+import asyncio
+import math
+import threading
+import time
+import weakref
+from collections import OrderedDict
+import httpx
+import numpy as np
 import requests
-from main.shared.data import get_token_info
+from main.shared import aio
+from main.shared.config import QUOTE_CACHE_TTL, PRICE_CURVE_TTL
+from main.shared.data import get_token_info, symbol_to_mint
+from main.shared.rate_limit import get_bucket, retry_after
+
+JUPITER_QUOTE_URL = "https://lite-api.jup.ag/swap/v1/quote"
+RETRIES_ON_429 = 2
+NO_ROUTE_ERRORS = ("COULD_NOT_FIND_ANY_ROUTE", "NO_ROUTES_FOUND", "TOKEN_NOT_TRADABLE")
+
+# One HTTP/2 client per event loop (httpx connection pools are bound to a loop)
+_async_clients = weakref.WeakKeyDictionary()
+
+class QuoteCache:
+    """LRU cache of recent quotes that expire after ttl seconds
+    
+    Keyed by mint pair, amount bucket (bucket_pct wide) and slippage. A cached quote
+    is only returned if its inAmount does not exceed the requested amount, so a
+    reused quote never spends more than the caller asked for.
+    """
+
+    def __init__(self, ttl=QUOTE_CACHE_TTL, maxsize=256, bucket_pct=0.001):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.bucket_pct = bucket_pct
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _key(self, input_mint, output_mint, amount, slippage_bps):
+        bucket = int(math.log(amount) / math.log1p(self.bucket_pct)) if amount > 0 else 0
+        return (input_mint, output_mint, bucket, slippage_bps)
+
+    def get(self, input_mint, output_mint, amount, slippage_bps=50):
+        """Cached quote, or None if missing, expired or for a larger amount"""
+        key = self._key(input_mint, output_mint, amount, slippage_bps)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            created, quote = entry
+            if time.monotonic() - created > self.ttl:
+                del self.entries[key]
+                return None
+            if int(quote["inAmount"]) > amount:
+                return None
+            self.entries.move_to_end(key)
+            return quote
+
+    def put(self, input_mint, output_mint, amount, slippage_bps, quote):
+        key = self._key(input_mint, output_mint, amount, slippage_bps)
+        with self.lock:
+            self.entries[key] = (time.monotonic(), quote)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+_quote_cache = QuoteCache()
+_curve_cache = {}
+_curve_lock = threading.Lock()
 
 def get_quote(input_mint, output_mint, amount, slippage_bps=50):
-    """Get swap quote from Jupiter"""
+    """Get swap quote from Jupiter (stored in the quote cache, retried after backing off on HTTP 429)"""
+    bucket = get_bucket("jupiter_quote")
     try:
-        url = "https://lite-api.jup.ag/swap/v1/quote"
-        response = requests.get(url, params={
-            "inputMint": input_mint,
-            "outputMint": output_mint,
-            "amount": amount,
-            "slippageBps": slippage_bps
-        }, timeout=10)
+        for _ in range(RETRIES_ON_429 + 1):
+            bucket.wait()
+            response = requests.get(JUPITER_QUOTE_URL, params={
+                "inputMint": input_mint,
+                "outputMint": output_mint,
+                "amount": amount,
+                "slippageBps": slippage_bps
+            }, timeout=10)
+            if response.status_code != 429:
+                break
+            bucket.backoff(retry_after(response.headers))
         
         if response.status_code != 200:
             return None
+        bucket.success()
         data = response.json()
-        return None if "error" in data or "errorCode" in data else data
+        if "error" in data or "errorCode" in data:
+            return None
+        data["fetched"] = time.monotonic()
+        _quote_cache.put(input_mint, output_mint, amount, slippage_bps, data)
+        return data
     except:
         return None
 
+def get_cached_quote(input_mint, output_mint, amount, slippage_bps=50):
+    """Get a quote from the cache if still fresh, otherwise request a new one
+    
+    Quotes carry 'fetched' (time.monotonic() when Jupiter answered), so callers
+    holding on to one can tell its age.
+    """
+    return _quote_cache.get(input_mint, output_mint, amount, slippage_bps) or get_quote(input_mint, output_mint, amount, slippage_bps)
+
+def get_async_client():
+    """Shared HTTP/2 client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        _async_clients[loop] = httpx.AsyncClient(http2=True, timeout=10, limits=httpx.Limits(max_connections=20))
+    return _async_clients[loop]
+
+async def get_quote_async(input_mint, output_mint, amount, slippage_bps=50):
+    """Get swap quote from Jupiter without blocking
+    
+    Returns:
+        dict with 'status' ('ok', 'no_route', 'timeout', 'http_error' or 'error'),
+        'quote' (Jupiter response when ok), 'status_code', 'error' and the request fields
+    """
+    result = {"input_mint": input_mint, "output_mint": output_mint, "amount": amount,
+              "slippage_bps": slippage_bps, "status": "ok", "quote": None, "status_code": None, "error": None}
+    bucket = get_bucket("jupiter_quote")
+    try:
+        for _ in range(RETRIES_ON_429 + 1):
+            await bucket.wait_async()
+            response = await get_async_client().get(JUPITER_QUOTE_URL, params={
+                "inputMint": input_mint,
+                "outputMint": output_mint,
+                "amount": amount,
+                "slippageBps": slippage_bps
+            })
+            if response.status_code != 429:
+                break
+            bucket.backoff(retry_after(response.headers))
+    except httpx.TimeoutException as e:
+        return {**result, "status": "timeout", "error": str(e) or "timeout"}
+    except httpx.HTTPError as e:
+        return {**result, "status": "error", "error": str(e)}
+    if response.status_code != 429:
+        bucket.success()
+    try:
+        data = response.json()
+    except ValueError:
+        data = {}
+    result["status_code"] = response.status_code
+    error_code = data.get("errorCode") if isinstance(data, dict) else None
+    if error_code in NO_ROUTE_ERRORS:
+        return {**result, "status": "no_route", "error": data.get("error", error_code)}
+    if response.status_code != 200:
+        return {**result, "status": "http_error", "error": response.text[:200]}
+    if "error" in data or error_code:
+        return {**result, "status": "error", "error": data.get("error", error_code)}
+    data["fetched"] = time.monotonic()
+    _quote_cache.put(input_mint, output_mint, amount, slippage_bps, data)
+    return {**result, "quote": data}
+
+async def get_quotes_async(quote_requests, max_concurrency=8):
+    """Quote many (input_mint, output_mint, amount[, slippage_bps]) requests concurrently
+    
+    Returns:
+        list of get_quote_async results, in request order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async def limited(request):
+        async with semaphore:
+            return await get_quote_async(*request)
+    return await asyncio.gather(*(limited(r) for r in quote_requests))
+
+def get_quotes(quote_requests, max_concurrency=8):
+    """Blocking wrapper around get_quotes_async (runs on the shared background loop)"""
+    return aio.run(get_quotes_async(quote_requests, max_concurrency))
+
+def get_exchange_rates(input_symbols, output_symbol, amount, max_concurrency=8):
+    """Get exchange rates from many tokens into output_symbol in one concurrent batch
+    
+    Returns:
+        dict of input symbol -> rate (tokens without a usable quote are left out)
+    """
+    output_info = get_token_info(output_symbol)
+    infos = {s: get_token_info(s) for s in input_symbols}
+    infos = {s: info for s, info in infos.items() if info}
+    if not output_info:
+        return {}
+    symbols = list(infos)
+    results = get_quotes([
+        (infos[s]["mint"], output_info["mint"], int(amount * (10 ** infos[s]["decimals"]))) for s in symbols
+    ], max_concurrency)
+    rates = {}
+    for symbol, result in zip(symbols, results):
+        if result["status"] != "ok":
+            continue
+        quote = result["quote"]
+        in_amt = float(quote["inAmount"]) / (10 ** infos[symbol]["decimals"])
+        out_amt = float(quote["outAmount"]) / (10 ** output_info["decimals"])
+        if in_amt and out_amt:
+            rates[symbol] = out_amt / in_amt
+    return rates
+
 def get_exchange_rate(input_symbol, output_symbol, amount):
     """Get exchange rate between two tokens via Jupiter"""
     input_info = get_token_info(input_symbol)
@@ -39,3 +215,118 @@ def get_exchange_rate(input_symbol, output_symbol, amount):
     if not in_amt or not out_amt:
         return None
     return (float(out_amt) / (10 ** output_decimals)) / (float(in_amt) / (10 ** input_decimals))
+
+def get_prices(symbols):
+    """Get USD prices for many tokens via Jupiter Price API (50 mints per request)
+    
+    Cheaper than a quote per token but ignores size, meant for prefiltering only.
+    
+    Returns:
+        dict of symbol -> USD price (tokens without a price are left out)
+    """
+    mints = {symbol_to_mint(s): s for s in symbols if symbol_to_mint(s)}
+    mint_list = list(mints)
+    prices = {}
+    bucket = get_bucket("jupiter_quote")
+    for i in range(0, len(mint_list), 50):
+        bucket.wait()
+        try:
+            response = requests.get("https://lite-api.jup.ag/price/v3", params={
+                "ids": ",".join(mint_list[i:i + 50])
+            }, timeout=10)
+            if response.status_code == 429:
+                bucket.backoff(retry_after(response.headers))
+            data = response.json() if response.status_code == 200 else {}
+        except Exception as e:
+            print(f"Jupiter price request failed: {e}")
+            data = {}
+        for mint, item in data.items():
+            if item and item.get("usdPrice"):
+                prices[mints[mint]] = float(item["usdPrice"])
+    return prices
+
+def build_price_curves(symbols, side, max_usdt, points=6, max_concurrency=8):
+    """Quote a geometric ladder of trade sizes for many tokens in one concurrent batch
+    
+    Args:
+        symbols: Tokens to build curves for
+        side: 'buy' (spend USDT for the token, sizes in USDT) or
+              'sell' (sell the token for USDT, sizes in tokens)
+        max_usdt: Largest trade size in USDT; the ladder runs from max_usdt/100 up to it
+        points: Number of sizes quoted per token
+    
+    Returns:
+        dict of symbol -> curve dict with 'sizes' and 'prices' (effective USDT per token)
+        arrays sorted by size, plus 'side', 'max_usdt' and 'created'
+    """
+    usdt = get_token_info("USDT")
+    infos = {s: get_token_info(s) for s in symbols if get_token_info(s)}
+    # Sell-side sizes are in tokens, converted from USDT notionals at a reference price
+    ref_prices = get_prices(list(infos)) if side == "sell" else {}
+    notionals = np.geomspace(max_usdt / 100, max_usdt, points)
+    ladder = []
+    for symbol, info in infos.items():
+        for notional in notionals:
+            if side == "buy":
+                ladder.append((symbol, (usdt["mint"], info["mint"], int(notional * 10 ** usdt["decimals"]))))
+            elif symbol in ref_prices:
+                ladder.append((symbol, (info["mint"], usdt["mint"], int(notional / ref_prices[symbol] * 10 ** info["decimals"]))))
+    results = get_quotes([request for _, request in ladder], max_concurrency)
+    
+    points_by_symbol = {}
+    for (symbol, _), result in zip(ladder, results):
+        if result["status"] != "ok":
+            continue
+        quote = result["quote"]
+        token_decimals = infos[symbol]["decimals"]
+        if side == "buy":
+            size = int(quote["inAmount"]) / 10 ** usdt["decimals"]
+            tokens = int(quote["outAmount"]) / 10 ** token_decimals
+            usdt_amount = size
+        else:
+            size = tokens = int(quote["inAmount"]) / 10 ** token_decimals
+            usdt_amount = int(quote["outAmount"]) / 10 ** usdt["decimals"]
+        if tokens > 0 and usdt_amount > 0:
+            points_by_symbol.setdefault(symbol, []).append((size, usdt_amount / tokens))
+    
+    curves = {}
+    for symbol, curve_points in points_by_symbol.items():
+        curve_points.sort()
+        curves[symbol] = {
+            "side": side,
+            "sizes": np.array([size for size, _ in curve_points]),
+            "prices": np.array([price for _, price in curve_points]),
+            "max_usdt": max_usdt,
+            "created": time.monotonic()
+        }
+    return curves
+
+def get_price_curves(symbols, side, max_usdt, points=6, ttl=PRICE_CURVE_TTL):
+    """Cached price curves per token, rebuilding only missing, expired or too-short ones"""
+    now = time.monotonic()
+    curves, missing = {}, []
+    with _curve_lock:
+        for symbol in symbols:
+            curve = _curve_cache.get((symbol, side))
+            if curve and now - curve["created"] <= ttl and curve["max_usdt"] >= max_usdt:
+                curves[symbol] = curve
+            else:
+                missing.append(symbol)
+    if missing:
+        built = build_price_curves(missing, side, max_usdt, points)
+        with _curve_lock:
+            for symbol, curve in built.items():
+                _curve_cache[(symbol, side)] = curve
+        curves.update(built)
+    return curves
+
+def get_price_curve(symbol, side, max_usdt, points=6, ttl=PRICE_CURVE_TTL):
+    """Cached price curve for one token, or None if no size could be quoted"""
+    return get_price_curves([symbol], side, max_usdt, points, ttl).get(symbol)
+
+def curve_price(curve, size):
+    """Effective Jupiter price at size (number or array), linearly interpolated
+    
+    Sizes outside the quoted ladder use the nearest quoted price.
+    """
+    return np.interp(size, curve["sizes"], curve["prices"])
@@ -0,0 +1,19 @@
+"""Shared background asyncio loop for running coroutines from synchronous code"""
+import asyncio
+import threading
+
+_loop = None
+_lock = threading.Lock()
+
+def get_loop():
+    """Event loop running forever in a daemon thread (created on first use)"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
+def run(coro, timeout=None):
+    """Run a coroutine on the shared loop and block until it returns"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
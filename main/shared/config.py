@@ -24,6 +24,60 @@ def get_bybit_credentials():
     return api_key, api_secret
 
 SOLANA_RPC_URL = get_env_var("SOLANA_RPC_URL", required=False) or "https://api.mainnet-beta.solana.com"
+# Comma-separated RPC endpoints for the pool (defaults to SOLANA_RPC_URL alone)
+SOLANA_RPC_URLS = [url.strip() for url in (get_env_var("SOLANA_RPC_URLS", required=False) or SOLANA_RPC_URL).split(",")]
+RPC_HEDGE_AFTER = 0.3  # seconds before a read is duplicated to the next endpoint (None disables hedging)
+RPC_EWMA_ALPHA = 0.2  # weight of the newest sample in per-endpoint latency / error averages
+SOLANA_WS_URL = get_env_var("SOLANA_WS_URL", required=False) or SOLANA_RPC_URL.replace("http", "ws", 1)
 SOLANA_BASE_FEE_LAMPORTS = 5000
+BLOCKHASH_REFRESH_INTERVAL = 2  # seconds between background blockhash refreshes
+PRIORITY_FEE_REFRESH_INTERVAL = 10  # seconds between getRecentPrioritizationFees samples
+PRIORITY_FEE_PERCENTILE = 75
+PRIORITY_FEE_RANGE = (1000, 1000000)  # min/max compute-unit price in micro-lamports
+# Compute-unit limits for the transactions we build ourselves
+COMPUTE_UNIT_LIMITS = {"sol_transfer": 1000, "token_transfer": 10000, "create_ata": 30000, "swap": 400000}
+# Build Jupiter swaps locally from /swap-instructions instead of signing Jupiter's transaction
+JUPITER_LOCAL_SWAP = (get_env_var("JUPITER_LOCAL_SWAP", required=False) or "").lower() in ("1", "true")
+LOOKUP_TABLE_TTL = 3600  # seconds a resolved address lookup table is reused
+REBROADCAST_INTERVAL = 2  # seconds between resends of an unconfirmed transaction
+MAX_RESIGNS = 2  # fresh-blockhash re-signs after the original blockhash expires
+CONFIRM_TIMEOUT = 90  # seconds to wait for a signature before giving up (about one blockhash lifetime)
+DEPOSIT_TIMEOUT = 600  # seconds to wait for a cross-venue deposit to arrive
+DEPOSIT_POLL_RANGE = (2, 15)  # min / max seconds between balance polls while waiting for a deposit
+DEPOSIT_DEFAULT_ARRIVAL = 60  # assumed arrival time in seconds before any deposit of a coin was observed
+# Per-coin, per-direction stage latency sketches of executed arbitrages, persisted across runs
+LATENCY_PATH = os.path.join(os.path.dirname(__file__), "../../files", "transfer_latency.json")
+LATENCY_QUANTILES = (0.5, 0.9)
+TRANSFER_DEFAULT_LOCKUP = 600  # seconds of capital lockup assumed for coins without recorded trades
+# Destination token accounts known to exist, persisted across runs
+ATA_CACHE_PATH = os.path.join(os.path.dirname(__file__), "../../files", "known_atas.json")
 BYBIT_API_BASE = "https://api.bybit.com"
+BYBIT_WS_PUBLIC = "wss://stream.bybit.com/v5/public/spot"
+ORDERBOOK_MAX_AGE = 10  # seconds without a message after which a WebSocket book is not trusted
+BYBIT_WS_PRIVATE = "wss://stream.bybit.com/v5/private"
+BYBIT_ORDER_TIMEOUT = 10  # seconds to wait for an order to reach a final status on the private stream
+BYBIT_RECV_WINDOW = "20000"
+BYBIT_TIME_SYNC_INTERVAL = 600  # seconds between server clock offset measurements
+
+# (connect, read) timeouts in seconds by Bybit path prefix, first match wins
+BYBIT_TIMEOUTS = {
+    "/v5/market/": (3, 5),
+    "/v5/order/": (3, 5),
+    "/v5/asset/withdraw/": (3, 15),
+    "": (3, 10),
+}
+
+# Requests per second per venue and endpoint class, shared by all threads and tasks
+RATE_LIMITS = {
+    "bybit_market": float(get_env_var("BYBIT_RATE_LIMIT", required=False) or 20),
+    "bybit_private": float(get_env_var("BYBIT_PRIVATE_RATE_LIMIT", required=False) or 10),
+    "jupiter_quote": float(get_env_var("JUPITER_RATE_LIMIT", required=False) or 10),
+    "jupiter_swap": float(get_env_var("JUPITER_SWAP_RATE_LIMIT", required=False) or 2),
+    "solana_rpc": float(get_env_var("SOLANA_RPC_RATE_LIMIT", required=False) or 10),
+}
+RATE_LIMIT_BACKOFF = (0.5, 30)  # first and longest pause in seconds after an HTTP 429
+SCAN_MAX_WORKERS = 8
+SCAN_HEADROOM_TARGET = 0.005  # slippage headroom at which a ranked opportunity keeps its full profit score
+QUOTE_CACHE_TTL = 10  # seconds a Jupiter quote may be reused before execution
+PRICE_CURVE_TTL = 30  # seconds a Jupiter size → price curve stays valid
 
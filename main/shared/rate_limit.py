@@ -0,0 +1,120 @@
+"""Token-bucket request governor shared across threads and asyncio tasks
+
+One bucket per venue and endpoint class (see RATE_LIMITS in config). Buckets
+refill at their configured rate and can be paused: Bybit responses report how
+many calls remain on an endpoint until a reset time (tracked per endpoint, so
+one exhausted path does not stall the rest of its class), and HTTP 429s
+trigger an exponential backoff, so callers slow down before the venue starts
+rejecting them.
+"""
+import asyncio
+import threading
+import time
+from main.shared.config import RATE_LIMITS, RATE_LIMIT_BACKOFF
+
+_buckets = {}
+_lock = threading.Lock()
+
+class TokenBucket:
+    """Allows `rate` calls per second with bursts of up to `capacity` calls"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.backoffs = 0
+        self.limits = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, key=None):
+        """Take a token (and one call of `key`'s reported budget), returns seconds to wait before using it
+
+        Tokens may go negative: each caller queues behind the ones before it.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            delay = self.updated - now + max(0, -self.tokens) / self.rate
+            if key in self.limits:
+                remaining, reset_at = self.limits[key]
+                if now >= reset_at:
+                    del self.limits[key]
+                elif remaining <= 1:
+                    delay = max(delay, reset_at - now)
+                else:
+                    self.limits[key] = (remaining - 1, reset_at)
+            return delay
+
+    def wait(self, key=None):
+        """Block until a token is available"""
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, key=None):
+        """Sleep the current task until a token is available"""
+        delay = self.reserve(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next `seconds`"""
+        with self.lock:
+            resume = time.monotonic() + seconds
+            if resume > self.updated:
+                self.tokens = min(self.tokens, 0)
+                self.updated = resume
+
+    def limit_status(self, key, remaining, reset_in):
+        """Apply a venue-reported budget for endpoint `key`: `remaining` calls allowed until `reset_in` seconds from now
+
+        Only callers reserving with the same key are held back by it.
+        """
+        if reset_in <= 0:
+            return
+        with self.lock:
+            self.limits[key] = (remaining, time.monotonic() + reset_in)
+
+    def backoff(self, retry_after=None):
+        """Pause after a rejection (HTTP 429), doubling the pause on each consecutive one
+
+        Returns:
+            seconds paused
+        """
+        first, longest = RATE_LIMIT_BACKOFF
+        with self.lock:
+            self.backoffs += 1
+            delay = retry_after or min(longest, first * 2 ** (self.backoffs - 1))
+        self.pause(delay)
+        return delay
+
+    def success(self):
+        """Reset the backoff after an accepted request"""
+        with self.lock:
+            self.backoffs = 0
+
+def get_bucket(name):
+    """Shared bucket for an endpoint class ('bybit_market', 'bybit_private', 'jupiter_quote', 'jupiter_swap', 'solana_rpc')"""
+    with _lock:
+        if name not in _buckets:
+            _buckets[name] = TokenBucket(RATE_LIMITS[name])
+    return _buckets[name]
+
+def retry_after(headers):
+    """Seconds from a Retry-After header, or None"""
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+def rate_limit(name):
+    """Block until a request in endpoint class `name` is allowed"""
+    get_bucket(name).wait()
+
+async def rate_limit_async(name):
+    """Async version of rate_limit, shares the same bucket"""
+    await get_bucket(name).wait_async()
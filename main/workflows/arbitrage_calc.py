@@ -1,5 +1,11 @@
+import numpy as np
 
-def is_b2j_profitable(B, J, U, w, s_bybit):
+# Jupiter 固定滑点（无价格曲线时使用；价格曲线已包含价格冲击，此时为 0）
+B2J_JUPITER_SLIPPAGE = 0.002  # B→J有延迟，设置更保守
+J2B_JUPITER_SLIPPAGE = 0.001  # 无法通过orderbook估算
+
+
+def is_b2j_profitable(B, J, U, w, s_bybit, jupiter_curve=None):
     """
     Bybit → Jupiter 无亏损条件检查并计算预期利润
     
@@ -11,18 +17,24 @@ def is_b2j_profitable(B, J, U, w, s_bybit):
         U: Bybit端初始USDT数量
         w: Bybit提币手续费 (USDT绝对值)
         s_bybit: Bybit端预期滑点，通过orderbook估算 (小数形式)
+        jupiter_curve: Jupiter卖出价格曲线 (get_price_curve(..., 'sell', ...))，传入时
+                       按实际卖出数量插值得到J，并取代固定滑点
     
     返回:
         (profitable, expected_profit):
         - profitable: True表示满足套利条件，False表示不满足
         - expected_profit: 预期利润 (USDT)
     """
-    s_jupiter = 0.002  # Jupiter 固定滑点 0.2% (B→J有延迟，设置更保守)
+    s_jupiter = B2J_JUPITER_SLIPPAGE
     gas = 0.001
     fee_bybit = 0.01
     
     # 计算预期利润
     tokens = (U - w) / (B * (1 + s_bybit) * (1 + fee_bybit))
+    if jupiter_curve is not None:
+        # 曲线价格已包含该数量下的价格冲击
+        J = np.interp(tokens, jupiter_curve["sizes"], jupiter_curve["prices"])
+        s_jupiter = 0
     final_usdt = tokens * J * (1 - s_jupiter) - gas
     expected_profit = final_usdt - U
     
@@ -32,11 +44,11 @@ def is_b2j_profitable(B, J, U, w, s_bybit):
     return profitable, expected_profit
 
 
-def get_b2j_max_slippage(J, B, U, w):
+def get_b2j_max_slippage(J, B, U, w, s_jupiter=B2J_JUPITER_SLIPPAGE):
     """
     Bybit → Jupiter 滑点上限推导（盈亏平衡点）
     
-    公式: sᴮ_max = [J × 0.998 × (U - w)] / [B × 1.01 × (U + 0.001)] - 1
+    公式: sᴮ_max = [J × (1 - sᴶ) × (U - w)] / [B × 1.01 × (U + 0.001)] - 1
     
     说明: 计算在给定条件下，Bybit最大可承受的滑点（盈亏平衡点）
     
@@ -45,13 +57,13 @@ def get_b2j_max_slippage(J, B, U, w):
         B: Bybit上代币价格 (USDT/枚)
         U: Bybit端初始USDT数量
         w: Bybit提币手续费 (USDT绝对值)
+        s_jupiter: Jupiter端滑点（J 取自价格曲线时传 0）
     
     返回:
         Bybit最大可承受滑点（盈亏平衡点）
     """
     gas = 0.001
     fee_bybit = 0.01
-    s_jupiter = 0.002  # Jupiter 固定滑点 0.2% (B→J有延迟，设置更保守)
     
     numerator = J * (1 - s_jupiter) * (U - w)
     denominator = B * (1 + fee_bybit) * (U + gas)
@@ -59,7 +71,7 @@ def get_b2j_max_slippage(J, B, U, w):
     return numerator / denominator - 1
 
 
-def is_j2b_profitable(J, B, U, s_bybit):
+def is_j2b_profitable(J, B, U, s_bybit, jupiter_curve=None):
     """
     Jupiter → Bybit 无亏损条件检查并计算预期利润
     
@@ -70,16 +82,23 @@ def is_j2b_profitable(J, B, U, s_bybit):
         B: Bybit上代币价格 (USDT/枚)
         U: Jupiter端初始USDT数量
         s_bybit: Bybit端预期滑点，通过orderbook估算 (小数形式)
+        jupiter_curve: Jupiter买入价格曲线 (get_price_curve(..., 'buy', ...))，传入时
+                       按实际投入USDT插值得到J，并取代固定滑点
     
     返回:
         (profitable, expected_profit): 
         - profitable: True表示满足套利条件，False表示不满足
         - expected_profit: 预期利润 (USDT)
     """
-    s_jupiter = 0.001  # Jupiter 固定滑点容忍度 0.1% (无法通过orderbook估算)
+    s_jupiter = J2B_JUPITER_SLIPPAGE
     gas = 0.002
     fee_bybit = 0.001
     
+    if jupiter_curve is not None:
+        # 曲线价格已包含该金额下的价格冲击
+        J = np.interp(U - gas, jupiter_curve["sizes"], jupiter_curve["prices"])
+        s_jupiter = 0
+    
     # 计算预期利润
     tokens = (U - gas) / (J * (1 + s_jupiter))
     final_usdt = tokens * B * (1 - s_bybit) * (1 - fee_bybit)
@@ -116,3 +135,50 @@ def get_j2b_max_slippage(B, J, U, s_bybit):
     
     return numerator / denominator - 1
 
+
+def find_optimal_size(direction, snapshot, max_U, w=0, J=None, jupiter_curve=None, points=50):
+    """
+    在投入规模网格上向量化求解利润最大的 U
+    
+    说明: 对每个 U 用 Bybit 订单簿快照计算该数量下的均价与滑点，Jupiter 价格取自
+    价格曲线（按实际规模插值）或固定价格 J，再代入 is_b2j_profitable / is_j2b_profitable
+    的手续费模型，一次计算整个网格
+    
+    参数:
+        direction: 'B→J' 或 'J→B'
+        snapshot: Bybit OrderbookSnapshot
+        max_U: 最大可投入USDT数量（网格为 max_U/points 到 max_U）
+        w: Bybit提币手续费 (仅 B→J)
+        J: Jupiter上代币价格，未传入价格曲线时使用
+        jupiter_curve: Jupiter价格曲线 (B→J 为 'sell'，J→B 为 'buy')
+        points: 网格点数
+    
+    返回:
+        dict: 'size' 最优投入U, 'profit' 对应预期利润, 'sizes'/'profits' 整个网格
+              （没有可成交规模时 size 为 0, profit 为 None）
+    """
+    U = np.linspace(max_U / points, max_U, points)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if direction == 'B→J':
+            side = 'buy'
+            if jupiter_curve is not None:
+                # 卖出曲线以代币数量为横轴，先按最小规模价格估算数量再插值
+                J_ref = np.interp(U / jupiter_curve["prices"][0], jupiter_curve["sizes"], jupiter_curve["prices"])
+            else:
+                J_ref = J
+            qty = U / J_ref
+            B = snapshot.vwap(side, qty)
+            _, profits = is_b2j_profitable(B, J, U, w, snapshot.slippage(side, qty), jupiter_curve)
+        else:
+            side = 'sell'
+            J_at_U = np.interp(U, jupiter_curve["sizes"], jupiter_curve["prices"]) if jupiter_curve is not None else J
+            qty = U / J_at_U
+            B = snapshot.vwap(side, qty)
+            _, profits = is_j2b_profitable(J_at_U, B, U, snapshot.slippage(side, qty), jupiter_curve)
+    # 超出订单簿深度的规模无法按该均价成交
+    profits = np.where((B > 0) & (qty <= snapshot.depth_within(side, np.inf)), profits, -np.inf)
+    if not np.isfinite(profits).any():
+        # 订单簿深度不足以支撑任何网格规模
+        return {'size': 0.0, 'profit': None, 'sizes': U, 'profits': profits}
+    best = int(np.argmax(profits))
+    return {'size': float(U[best]), 'profit': float(profits[best]), 'sizes': U, 'profits': profits}
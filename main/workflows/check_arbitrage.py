@@ -1,10 +1,24 @@
+import threading
 import time
-from main.jupiter.monitor.pricing import get_exchange_rate
-from main.bybit.monitor.pricing import get_buy_rate, get_sell_rate
-from main.workflows.arbitrage_calc import is_b2j_profitable, is_j2b_profitable
-from main.shared.data import get_withdrawal_fee
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from main.jupiter.monitor.pricing import get_exchange_rate, get_exchange_rates, get_prices, get_price_curve, get_price_curves, curve_price
+from main.bybit.monitor.pricing import get_orderbook_snapshot, get_all_tickers
+from main.workflows.arbitrage_calc import (
+    is_b2j_profitable, is_j2b_profitable, get_b2j_max_slippage, get_j2b_max_slippage, find_optimal_size,
+    B2J_JUPITER_SLIPPAGE, J2B_JUPITER_SLIPPAGE
+)
+from main.shared.data import get_withdrawal_fee, get_all_tradeable_symbols
+from main.shared.config import SCAN_MAX_WORKERS, SCAN_HEADROOM_TARGET
+from main.workflows.transfer_latency import get_latency_model
 
-def check_arbitrage(base_coin, usdt_balance, direction):
+# Jupiter price curves are quoted up to this multiple of the trade size
+CURVE_SIZE_MULTIPLE = 2
+
+def _curve_side(direction):
+    """Jupiter side traded in a direction: B→J sells on Jupiter, J→B buys"""
+    return 'sell' if direction == 'B→J' else 'buy'
+
+def check_arbitrage(base_coin, usdt_balance, direction, J=None, use_curve=True, verbose=True):
     """
     Check for arbitrage opportunities for a given coin
     
@@ -12,83 +26,360 @@ def check_arbitrage(base_coin, usdt_balance, direction):
         base_coin: Base coin symbol (e.g., 'SOL', 'BTC')
         usdt_balance: Amount of USDT to trade
         direction: Direction to check ('B→J' or 'J→B')
+        J: Jupiter price already quoted for this coin (quoted here if None)
+        use_curve: Price Jupiter from the cached size → price curve at the actual
+                   trade size; False (or no curve available) uses a 1-token quote
+                   plus a fixed slippage
+        verbose: Print a progress line for the coin
     
     Returns:
         dict with keys: 'direction', 'profitable', 'profit', 'bybit_price', 
-        'jupiter_price', 'slippage', 'usdt_balance'
+        'jupiter_price', 'slippage', 'jupiter_slippage', 'usdt_balance', 'optimal_size',
+        'optimal_profit'
+        (jupiter_slippage is the fixed Jupiter slippage applied, 0 when J comes from a curve;
+        optimal_size is the profit-maximising USDT amount up to usdt_balance;
+        0 with optimal_profit None when the book cannot fill any size)
     """
     if direction not in ['B→J', 'J→B']:
         raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
     
-    print(f"\nChecking {base_coin}...", end=" ")
-    
     w = get_withdrawal_fee(base_coin)
     if w is None:
-        print("No withdrawal fee data")
+        if verbose:
+            print(f"\nChecking {base_coin}... No withdrawal fee data")
         return None
     
-    J = get_exchange_rate(base_coin, "USDT", 1)
+    curve = None
+    if use_curve:
+        curve = get_price_curve(base_coin, _curve_side(direction), usdt_balance * CURVE_SIZE_MULTIPLE)
+        if curve is not None:
+            # Buy curve sizes are USDT; sell curve sizes are tokens, sized from the smallest quote
+            size = usdt_balance if direction == 'J→B' else usdt_balance / curve['prices'][0]
+            J = float(curve_price(curve, size))
+    if curve is None:
+        # Fixed-slippage fallback when no size could be quoted
+        J = J or get_exchange_rate(base_coin, "USDT", 1)
     if not J:
-        print("No Jupiter data")
+        if verbose:
+            print(f"\nChecking {base_coin}... No Jupiter data")
         return None
     
     estimated_qty = usdt_balance / J
+    snapshot = get_orderbook_snapshot(base_coin)
     
     if direction == 'B→J':
-        bybit_buy = get_buy_rate(base_coin, estimated_qty)
+        bybit_buy = snapshot.buy_rate(estimated_qty)
         B_price = bybit_buy['rate']
         slippage = bybit_buy['slippage']
-        profitable, profit = is_b2j_profitable(B_price, J, usdt_balance, w, slippage)
+        profitable, profit = is_b2j_profitable(B_price, J, usdt_balance, w, slippage, curve)
     else:
-        bybit_sell = get_sell_rate(base_coin, estimated_qty)
+        bybit_sell = snapshot.sell_rate(estimated_qty)
         B_price = bybit_sell['rate']
         slippage = bybit_sell['slippage']
-        profitable, profit = is_j2b_profitable(J, B_price, usdt_balance, slippage)
+        profitable, profit = is_j2b_profitable(J, B_price, usdt_balance, slippage, curve)
+    optimal = find_optimal_size(direction, snapshot, usdt_balance, w, J, curve)
     
-    print(f"B=${B_price:.6f} | J=${J:.6f} | Slip={slippage:.2%}", end=" ")
-    if profitable:
-        print(f"✓ ${profit:.2f}")
-    else:
-        print(f"✗ ${profit:.2f}")
+    # One print per coin so concurrent scans don't interleave partial lines
+    if verbose:
+        print(f"\nChecking {base_coin}... B=${B_price:.6f} | J=${J:.6f} | Slip={slippage:.2%} {'✓' if profitable else '✗'} ${profit:.2f}")
     
     return {
         'direction': direction if profitable else None,
-        'profitable': profitable,
-        'profit': profit,
+        'profitable': bool(profitable),
+        'profit': float(profit),
         'bybit_price': B_price,
         'jupiter_price': J,
         'slippage': slippage,
-        'usdt_balance': usdt_balance
+        'jupiter_slippage': 0.0 if curve is not None else (B2J_JUPITER_SLIPPAGE if direction == 'B→J' else J2B_JUPITER_SLIPPAGE),
+        'usdt_balance': usdt_balance,
+        'optimal_size': optimal['size'],
+        'optimal_profit': optimal['profit']
     }
 
-def scan_all_opportunities(usdt_balance, direction):
+def prefilter_symbols(usdt_balance, direction, symbols=None, slack=0.005, verbose=True):
+    """
+    Drop coins whose top-of-book spread cannot break even, using two bulk requests
+    
+    Compares Bybit best ask (B→J) or best bid (J→B) from one tickers call with
+    Jupiter Price API prices. A coin passes if the break-even slippage bound is
+    still reachable with zero Bybit slippage:
+        B→J: get_b2j_max_slippage(J, B, U, w) ≥ -slack
+        J→B: get_j2b_max_slippage(B, J, U, 0) ≥ J2B_JUPITER_SLIPPAGE - slack
+    
+    Args:
+        usdt_balance: Amount of USDT to trade
+        direction: Direction to check ('B→J' or 'J→B')
+        symbols: Coins to filter (default: all tradeable symbols)
+        slack: Allowance for the gap between the cheap price and a real quote
+    
+    Returns:
+        list of coins worth a full depth and quote check
+    """
+    if direction not in ['B→J', 'J→B']:
+        raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
+    
+    symbols = symbols or get_all_tradeable_symbols()
+    tickers = get_all_tickers()
+    prices = get_prices(symbols)
+    
+    passed = []
+    for symbol in symbols:
+        w = get_withdrawal_fee(symbol)
+        ticker, J = tickers.get(symbol), prices.get(symbol)
+        if w is None or not ticker or not J:
+            continue
+        if direction == 'B→J':
+            bound = get_b2j_max_slippage(J, ticker['ask'], usdt_balance, w)
+        else:
+            bound = get_j2b_max_slippage(ticker['bid'], J, usdt_balance, 0) - J2B_JUPITER_SLIPPAGE
+        if bound >= -slack:
+            passed.append(symbol)
+    if verbose:
+        print(f"\nPrefilter [{direction}]: {len(passed)}/{len(symbols)} coins pass top-of-book check")
+    return passed
+
+def scan_opportunities_concurrent(usdt_balance, direction, max_workers=SCAN_MAX_WORKERS, prefilter=False, use_curve=True):
+    """
+    Check every tradeable coin in one pass using a bounded thread pool
+    
+    Jupiter prices (or price curves) for all coins are quoted up front in one
+    concurrent batch.
+    Request rates are capped per endpoint class by main.shared.rate_limit, so the pool
+    size only bounds how many checks are in flight at once.
+    
+    Args:
+        usdt_balance: Amount of USDT to trade
+        direction: Direction to check ('B→J' or 'J→B')
+        max_workers: Number of coins checked concurrently
+        prefilter: Only check coins passing prefilter_symbols
+        use_curve: Price Jupiter from size → price curves (see check_arbitrage)
+    
+    Returns:
+        list of check_arbitrage result dicts (with 'coin' added), in symbol order
+    """
+    if direction not in ['B→J', 'J→B']:
+        raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
+    
+    symbols, check = _prepare_scan(usdt_balance, direction, max_workers, prefilter, use_curve)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(check, symbols))
+    return [r for r in results if r]
+
+def _prepare_scan(usdt_balance, direction, max_workers, prefilter, use_curve, verbose=True):
+    """Symbols to scan and a check(symbol) function, with Jupiter prices quoted up front in one batch"""
+    symbols = prefilter_symbols(usdt_balance, direction, verbose=verbose) if prefilter else get_all_tradeable_symbols()
+    if use_curve:
+        # Curves land in the cache; check_arbitrage reads its J from there
+        curves = get_price_curves(symbols, _curve_side(direction), usdt_balance * CURVE_SIZE_MULTIPLE)
+        jupiter_prices = {symbol: None for symbol in curves}
+        # Coins without a curve fall back to a 1-token quote
+        jupiter_prices.update(get_exchange_rates([s for s in symbols if s not in curves], "USDT", 1, max_workers))
+    else:
+        jupiter_prices = get_exchange_rates(symbols, "USDT", 1, max_workers)
+    
+    def check(symbol):
+        if symbol not in jupiter_prices:
+            if verbose:
+                print(f"\nChecking {symbol}... No Jupiter data")
+            return None
+        try:
+            result = check_arbitrage(symbol, usdt_balance, direction, jupiter_prices[symbol], use_curve, verbose)
+        except Exception as e:
+            if verbose:
+                print(f"\nChecking {symbol}... Error - {e}")
+            return None
+        if result:
+            result['coin'] = symbol
+        return result
+    
+    return symbols, check
+
+def score_opportunity(result, direction):
+    """
+    Add 'profit_pct', 'headroom' and 'score' to a check_arbitrage result (with 'coin')
+    
+    headroom is how much more slippage the trade could absorb before breaking even:
+        B→J: get_b2j_max_slippage(J, B, U, w, Jupiter slippage) - Bybit slippage
+        J→B: get_j2b_max_slippage(B, J, U, Bybit slippage) - Jupiter slippage
+    using the same J and Jupiter slippage ('jupiter_slippage') that priced the profit.
+    score is the profit, scaled down linearly while headroom is below SCAN_HEADROOM_TARGET
+    so thin edges that one tick can erase rank behind sturdier ones; losses keep their profit.
+    """
+    U, B, J = result['usdt_balance'], result['bybit_price'], result['jupiter_price']
+    if direction == 'B→J':
+        headroom = get_b2j_max_slippage(J, B, U, get_withdrawal_fee(result['coin']), result['jupiter_slippage']) - result['slippage']
+    else:
+        headroom = get_j2b_max_slippage(B, J, U, result['slippage']) - result['jupiter_slippage']
+    result['profit_pct'] = result['profit'] / U
+    result['headroom'] = headroom
+    result['score'] = result['profit'] * min(1, max(0, headroom) / SCAN_HEADROOM_TARGET) if result['profit'] > 0 else result['profit']
+    return result
+
+class OpportunityRanking:
+    """Thread-safe top-k of scored scan results, readable while the scan is still running"""
+    
+    def __init__(self, k=5, key='score'):
+        self.k = k
+        self.key = key
+        self.results = []
+        self.checked = 0
+        self.total = None
+        self.lock = threading.Lock()
+    
+    def add(self, result):
+        """Count one checked coin and keep its result (None for coins that could not be checked)"""
+        with self.lock:
+            self.checked += 1
+            if result:
+                self.results.append(result)
+    
+    def top(self, profitable_only=False):
+        """Current best k results by key (complete once checked == total)"""
+        with self.lock:
+            results = [r for r in self.results if r['profitable'] or not profitable_only]
+        return sorted(results, key=lambda r: r[self.key], reverse=True)[:self.k]
+
+def rank_opportunities(usdt_balance, direction, k=None, max_workers=SCAN_MAX_WORKERS, prefilter=False, use_curve=True, key=None, ranking=None):
+    """
+    Check every coin and return the top k by score (see score_opportunity)
+    
+    Results are added to ranking as each coin completes, so another thread holding
+    the same OpportunityRanking can read ranking.top() mid-scan.
+    
+    Args:
+        usdt_balance: Amount of USDT to trade
+        direction: Direction to check ('B→J' or 'J→B')
+        k: Number of results returned (default 5)
+        key: Result field to rank by ('score' (default), 'profit', 'profit_pct' or 'headroom')
+        ranking: OpportunityRanking to fill (a new one if None); k and key must
+                 match it if also given
+    
+    Returns:
+        list of up to k scored result dicts, best first (profitable or not)
+    """
+    if direction not in ['B→J', 'J→B']:
+        raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
+    
+    if ranking is None:
+        ranking = OpportunityRanking(k or 5, key or 'score')
+    elif (k is not None and k != ranking.k) or (key is not None and key != ranking.key):
+        raise ValueError(f"k={k}, key={key} conflict with the ranking's k={ranking.k}, key={ranking.key}")
+    symbols, check = _prepare_scan(usdt_balance, direction, max_workers, prefilter, use_curve)
+    ranking.total = len(symbols)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for future in as_completed([pool.submit(check, symbol) for symbol in symbols]):
+            result = future.result()
+            ranking.add(score_opportunity(result, direction) if result else None)
+    return ranking.top()
+
+def iter_opportunities(usdt_balance, direction, max_workers=SCAN_MAX_WORKERS, prefilter=False, use_curve=True, deadline=None, cancel=None, verbose=False):
+    """
+    Yield each coin's scored result as soon as its check completes
+    
+    Stops early when the caller breaks out of the loop (or closes the generator),
+    when cancel is set, or once deadline seconds have passed; checks still queued
+    are dropped. A supervisor can act on a strong result while the rest of the
+    universe is still being evaluated.
+    
+    Args:
+        usdt_balance: Amount of USDT to trade
+        direction: Direction to check ('B→J' or 'J→B')
+        max_workers: Number of coins checked concurrently
+        deadline: Seconds after the call (including the up-front Jupiter batch) to stop yielding
+        cancel: threading.Event that stops the scan from another thread
+        verbose: Print per-coin progress lines (off by default)
+    
+    Returns:
+        iterator of check_arbitrage result dicts with 'coin' and the score_opportunity
+        fields, in completion order (coins that could not be checked are skipped)
+    """
+    if direction not in ['B→J', 'J→B']:
+        raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
+    
+    # Not a generator itself, so the deadline clock starts here rather than at the first next()
+    end = None if deadline is None else time.monotonic() + deadline
+    return _iter_opportunities(usdt_balance, direction, max_workers, prefilter, use_curve, end, cancel, verbose)
+
+def _iter_opportunities(usdt_balance, direction, max_workers, prefilter, use_curve, end, cancel, verbose):
+    """Generator behind iter_opportunities, stopping at monotonic time end (None for no deadline)"""
+    symbols, check = _prepare_scan(usdt_balance, direction, max_workers, prefilter, use_curve, verbose)
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {pool.submit(check, symbol) for symbol in symbols}
+    try:
+        while pending and not (cancel and cancel.is_set()):
+            timeout = None if end is None else end - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            if cancel:
+                # Wake up regularly to notice cancellation
+                timeout = 0.2 if timeout is None else min(timeout, 0.2)
+            done, pending = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result:
+                    yield score_opportunity(result, direction)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def rank_by_profit_rate(results, direction, p=0.5):
+    """
+    Profitable results sorted by expected profit per minute of capital lockup
+    
+    Lockup is the p-quantile of the coin's recorded order → sold time in this
+    direction (transfer_latency), TRANSFER_DEFAULT_LOCKUP for coins never traded.
+    Adds 'lockup' (seconds) and 'profit_per_minute' to each result.
+    """
+    model = get_latency_model()
+    ranked = []
+    for result in results:
+        if not result['profitable']:
+            continue
+        result['lockup'] = model.expected_lockup(result['coin'], direction, p)
+        result['profit_per_minute'] = model.profit_per_minute(result['coin'], direction, result['profit'], p)
+        ranked.append(result)
+    return sorted(ranked, key=lambda r: r['profit_per_minute'], reverse=True)
+
+def scan_all_opportunities(usdt_balance, direction, max_workers=None, prefilter=False, use_curve=True, rank_by_lockup=False):
     """
     Scan tradeable coins until finding a profitable arbitrage opportunity
     
     Args:
         usdt_balance: Amount of USDT to trade
         direction: Direction to check ('B→J' or 'J→B')
+        max_workers: If set, check all coins concurrently with this many workers
+                     instead of one by one
+        prefilter: Only check coins passing prefilter_symbols
+        use_curve: Price Jupiter from size → price curves (see check_arbitrage)
+        rank_by_lockup: Check every coin and return the best profit per minute of
+                        capital lockup (see rank_by_profit_rate) instead of the first hit
     
     Returns:
         dict with first profitable opportunity found, or None if none found
+        (use rank_opportunities for a top-k list)
     """
     if direction not in ['B→J', 'J→B']:
         raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
     
-    from main.shared.data import get_all_tradeable_symbols
-    import time
+    if rank_by_lockup:
+        ranked = rank_by_profit_rate(scan_opportunities_concurrent(usdt_balance, direction, max_workers or SCAN_MAX_WORKERS, prefilter, use_curve), direction)
+        return ranked[0] if ranked else None
+    
+    if max_workers:
+        for result in scan_opportunities_concurrent(usdt_balance, direction, max_workers, prefilter, use_curve):
+            if result['profitable']:
+                return result
+        return None
     
-    symbols = get_all_tradeable_symbols()
+    symbols = prefilter_symbols(usdt_balance, direction) if prefilter else get_all_tradeable_symbols()
     
     for symbol in symbols:
         try:
-            result = check_arbitrage(symbol, usdt_balance, direction)
+            result = check_arbitrage(symbol, usdt_balance, direction, use_curve=use_curve)
             if result and result['profitable']:
                 result['coin'] = symbol
                 return result
         except Exception as e:
             print(f"Error - {e}")
-        time.sleep(1)
     
     return None
 
@@ -0,0 +1,129 @@
+"""Deposit arrival watcher for both venues"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import websocket
+from main.shared.config import SOLANA_WS_URL, DEPOSIT_TIMEOUT, DEPOSIT_POLL_RANGE, DEPOSIT_DEFAULT_ARRIVAL
+from main.shared.data import symbol_to_mint
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+class DepositWatcher:
+    """Resolves a Future when a venue balance reaches a threshold
+
+    Each watch polls the balance on an adaptive schedule: sparse while the
+    deposit is not yet expected (from the observed arrival times of that coin),
+    dense around and after the expected arrival. Push sources wake the poll
+    early: a Solana accountSubscribe on the receiving account, the Bybit private
+    wallet stream for UNIFIED balances, and Bybit deposit records once the
+    incoming transaction shows up there.
+    """
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.arrivals = {}
+
+    def watch(self, venue, coin, threshold, account_type="FUND", tx_id=None, timeout=DEPOSIT_TIMEOUT):
+        """Watch a balance in the background
+        
+        Args:
+            venue: 'jupiter' (wallet balance) or 'bybit' (account_type balance)
+            coin: Coin symbol
+            threshold: Balance that counts as arrived
+            tx_id: Incoming transaction signature, matched against Bybit deposit records
+        
+        Returns:
+            Future of dict with 'venue', 'coin', 'balance', 'elapsed' (raises ValueError on timeout)
+        """
+        if venue not in ("jupiter", "bybit"):
+            raise ValueError(f"venue must be 'jupiter' or 'bybit', got '{venue}'")
+        return self.executor.submit(self._watch, venue, coin.upper(), threshold, account_type, tx_id, timeout)
+
+    def next_delay(self, venue, coin, elapsed, seen=False):
+        """Seconds until the next poll: half the time left to the expected arrival, clamped to DEPOSIT_POLL_RANGE"""
+        low, high = DEPOSIT_POLL_RANGE
+        if seen:
+            return low
+        expected = self.arrivals.get((venue, coin), DEPOSIT_DEFAULT_ARRIVAL)
+        return min(high, max(low, (expected - elapsed) / 2))
+
+    def record_arrival(self, venue, coin, elapsed):
+        """Fold an observed arrival time into the coin's running estimate"""
+        previous = self.arrivals.get((venue, coin))
+        self.arrivals[(venue, coin)] = elapsed if previous is None else 0.3 * elapsed + 0.7 * previous
+
+    def _watch(self, venue, coin, threshold, account_type, tx_id, timeout):
+        kick = threading.Event()
+        close = self._subscribe(venue, coin, threshold, account_type, kick)
+        start = time.monotonic()
+        seen = False
+        try:
+            while True:
+                balance = self._balance(venue, coin, account_type)
+                elapsed = time.monotonic() - start
+                if balance >= threshold:
+                    self.record_arrival(venue, coin, elapsed)
+                    return {"venue": venue, "coin": coin, "balance": balance, "elapsed": elapsed}
+                if elapsed >= timeout:
+                    raise ValueError(f"Timeout: {coin} deposit did not arrive on {venue} after {timeout}s. Current: {balance}, Target: {threshold:.6f}")
+                if tx_id and not seen:
+                    seen = self._deposit_seen(coin, tx_id)
+                kick.wait(min(self.next_delay(venue, coin, elapsed, seen), timeout - elapsed))
+                kick.clear()
+        finally:
+            close()
+
+    def _balance(self, venue, coin, account_type):
+        if venue == "jupiter":
+            from main.jupiter.account.balance import get_token_balance
+            return get_token_balance(coin)
+        from main.bybit.account.balance import get_balance
+        return get_balance(coin, account_type)
+
+    def _deposit_seen(self, coin, tx_id):
+        """True once Bybit lists the incoming transaction in its deposit records"""
+        from main.bybit.account.transfers import get_deposit_records
+        try:
+            return any(record.get("txID") == tx_id for record in get_deposit_records(coin))
+        except Exception as e:
+            print(f"⚠️  Deposit record query failed: {e}")
+            return False
+
+    def _subscribe(self, venue, coin, threshold, account_type, kick):
+        """Start the push source for a watch, returns a function that stops it"""
+        if venue == "jupiter":
+            return self._subscribe_account(coin, kick)
+        if account_type == "UNIFIED":
+            from main.bybit.monitor.private_stream import get_private_stream
+            future = get_private_stream().await_balance(coin, threshold, account_type)
+            future.add_done_callback(lambda f: kick.set())
+            return future.cancel
+        return lambda: None
+
+    def _subscribe_account(self, coin, kick):
+        """accountSubscribe on the wallet (SOL) or its token account; any change wakes the poll"""
+        from main.jupiter.helper.client import get_wallet
+        wallet = get_wallet()
+        address = wallet.address if coin == "SOL" else str(wallet.ata(symbol_to_mint(coin)))
+        request = {"jsonrpc": "2.0", "id": 1, "method": "accountSubscribe",
+                   "params": [address, {"commitment": "confirmed", "encoding": "base64"}]}
+        def on_message(ws, message):
+            if json.loads(message).get("method") == "accountNotification":
+                kick.set()
+        ws = websocket.WebSocketApp(SOLANA_WS_URL, on_open=lambda ws: ws.send(json.dumps(request)), on_message=on_message)
+        threading.Thread(target=ws.run_forever, daemon=True).start()
+        return ws.close
+
+def get_deposit_watcher():
+    """Shared deposit watcher (keeps arrival-time estimates for the process lifetime)"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = DepositWatcher()
+    return _watcher
+
+def watch_deposit(venue, coin, threshold, account_type="FUND", tx_id=None, timeout=DEPOSIT_TIMEOUT):
+    """Future resolved when the balance reaches threshold (see DepositWatcher.watch)"""
+    return get_deposit_watcher().watch(venue, coin, threshold, account_type, tx_id, timeout)
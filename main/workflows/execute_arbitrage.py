@@ -1,13 +1,26 @@
 """Execute arbitrage trades between Bybit and Jupiter"""
-import time
-from main.jupiter.account.swap import u_to_crypto as jupiter_u_to_crypto, crypto_to_u as jupiter_crypto_to_u
+from main.jupiter.account.swap import u_to_crypto as jupiter_u_to_crypto, crypto_to_u as jupiter_crypto_to_u, warm_swap_in_background as jupiter_warm_swap
 from main.jupiter.account.transfers import withdraw as jupiter_withdraw
-from main.jupiter.account.balance import check_balance as jupiter_check_balance
-from main.jupiter.monitor.pricing import get_exchange_rate as jupiter_get_rate
+from main.jupiter.account.balance import check_balance as jupiter_check_balance, get_all_balances as jupiter_get_all_balances
+from main.jupiter.monitor.blockhash import get_blockhash_cache
+from main.jupiter.monitor.pricing import get_exchange_rate as jupiter_get_rate, get_cached_quote as jupiter_get_quote
 from main.bybit.account.swap import u_to_crypto as bybit_u_to_crypto, crypto_to_u as bybit_crypto_to_u
 from main.bybit.account.transfers import withdraw as bybit_withdraw
 from main.bybit.account.balance import get_balance as bybit_get_balance
 from main.bybit.monitor.pricing import get_buy_rate, get_sell_rate
+from main.bybit.monitor.private_stream import get_private_stream, wait_order as bybit_wait_order, wait_balance as bybit_wait_balance
+from main.shared.data import get_token_info
+from main.shared.config import JUPITER_LOCAL_SWAP
+from main.workflows.deposit_watcher import watch_deposit
+from main.workflows.transfer_latency import TransferClock
+
+def _jupiter_quote(input_symbol, output_symbol, amount, slippage_bps):
+    """Quote amount of input_symbol (cached so the swap can reuse it), returns (quote, output amount)"""
+    input_info, output_info = get_token_info(input_symbol), get_token_info(output_symbol)
+    quote = jupiter_get_quote(input_info["mint"], output_info["mint"], int(amount * (10 ** input_info["decimals"])), slippage_bps)
+    if not quote:
+        raise ValueError(f"Failed to get Jupiter quote for {input_symbol} → {output_symbol}")
+    return quote, float(quote["outAmount"]) / (10 ** output_info["decimals"])
 
 def execute_arbitrage(base_coin, direction, skip_confirmation=False):
     """
@@ -19,19 +32,27 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
         skip_confirmation: Skip manual confirmation prompts (default: False)
     
     Returns:
-        dict with keys: 'success', 'direction', 'coin', 'steps', 'error'
+        dict with keys: 'success', 'direction', 'coin', 'steps', 'error',
+        'timings' (seconds between stages, recorded in the transfer latency model
+        when the run succeeds without manual confirmation)
     """
     if direction not in ['B→J', 'J→B']:
         raise ValueError(f"direction must be 'B→J' or 'J→B', got '{direction}'")
     
     base_coin = base_coin.upper()
+    # Warm the blockhash/priority-fee cache so on-chain sends sign immediately,
+    # and connect the Bybit private stream so order fills are pushed
+    get_blockhash_cache()
+    get_private_stream()
     result = {
         'success': False,
         'direction': direction,
         'coin': base_coin,
         'steps': [],
-        'error': None
+        'error': None,
+        'timings': None
     }
+    clock = TransferClock(base_coin, direction)
     
     try:
         if direction == 'B→J':
@@ -51,80 +72,67 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
             print(f"📊 预计购买数量: ~{estimated_qty:.6f} {base_coin}")
             
             initial_bybit_balance = bybit_get_balance(base_coin, "UNIFIED")
+            clock.mark("order")
             bybit_buy = bybit_u_to_crypto(base_coin, bybit_price)
-            expected_amount = bybit_buy.get("expected_amount", 0)
-            actual_price = initial_balance / expected_amount if expected_amount > 0 else 0
-            
-            print(f"✅ Bought {base_coin} on Bybit")
+            if bybit_buy.get("status") != "success":
+                raise ValueError(f"Bybit buy failed: {bybit_buy.get('retMsg')}")
+            buy_order = bybit_wait_order(bybit_buy["orderId"])
+            filled_amount = float(buy_order["cumExecQty"] or 0)
+            if filled_amount <= 0:
+                raise ValueError(f"Bybit buy not filled ({buy_order['orderStatus']})")
+            actual_price = float(buy_order["cumExecValue"]) / filled_amount
+            
+            print(f"✅ Bought {filled_amount} {base_coin} on Bybit ({buy_order['orderStatus']})")
             print(f"📈 实际成交价: ${actual_price:.6f}")
             print(f"📈 价格差异: {((actual_price - bybit_price) / bybit_price * 100):.3f}%")
             
             result['steps'].append({'step': 'bybit_buy', 'result': bybit_buy})
             
-            print(f"⏳ Waiting for balance to update (need at least {expected_amount * 0.5:.6f} {base_coin})...")
-            max_wait = 600
-            elapsed = 0
-            target_balance = initial_bybit_balance + (expected_amount * 0.5)
-            balance_confirmed = False
-            while elapsed < max_wait:
-                time.sleep(10)
-                elapsed += 10
-                current_balance = bybit_get_balance(base_coin, "UNIFIED")
-                if current_balance >= target_balance:
-                    print(f"✅ Balance updated: {current_balance} {base_coin} (waited {elapsed}s)")
-                    print(f"⏳ Waiting extra 10 seconds for security...")
-                    time.sleep(10)
-                    balance_confirmed = True
-                    break
-                print(f"   Retrying... current balance: {current_balance} {base_coin}, target: {target_balance:.6f} ({elapsed}s elapsed)")
-            
-            if not balance_confirmed:
-                raise ValueError(f"Timeout: Balance did not update after {max_wait}s. Current: {current_balance}, Target: {target_balance:.6f}")
+            target_balance = initial_bybit_balance + (filled_amount * 0.5)
+            current_balance = bybit_wait_balance(base_coin, target_balance)
+            clock.mark("balance_confirmed")
+            print(f"✅ Balance updated: {current_balance} {base_coin}")
             
             print(f"\n📍 Step 2/3: Withdraw {base_coin} from Bybit to Jupiter")
             bybit_withdrawal = bybit_withdraw(base_coin)
             withdrawn_amount = bybit_withdrawal.get('amount', 0) if bybit_withdrawal else 0
             result['steps'].append({'step': 'bybit_withdraw', 'result': bybit_withdrawal})
+            clock.mark("withdrawal_created")
             print(f"✅ Withdrawal initiated from Bybit")
             
+            warmed_sell = None
+            if JUPITER_LOCAL_SWAP and withdrawn_amount > 0:
+                # A signed sell would expire before the deposit lands; cache the route's lookup tables instead
+                warm_quote, _ = _jupiter_quote(base_coin, "USDT", withdrawn_amount, 100000)
+                warmed_sell = jupiter_warm_swap(warm_quote)
+            
             if not skip_confirmation:
                 input("⏸️  Press Enter after confirming deposit on Jupiter...")
             else:
                 print(f"⏳ Waiting for {base_coin} deposit to arrive on Jupiter (need at least {withdrawn_amount * 0.5:.6f})...")
-                initial_jupiter_balance = jupiter_check_balance(base_coin)
-                target_balance = initial_jupiter_balance + (withdrawn_amount * 0.5)
-                max_wait = 600
-                elapsed = 0
-                balance_confirmed = False
-                while elapsed < max_wait:
-                    time.sleep(10)
-                    elapsed += 10
-                    current_balance = jupiter_check_balance(base_coin)
-                    if current_balance >= target_balance:
-                        print(f"✅ Deposit confirmed: {current_balance} {base_coin} (waited {elapsed}s)")
-                        print(f"⏳ Waiting extra 10 seconds for security...")
-                        time.sleep(10)
-                        balance_confirmed = True
-                        break
-                    print(f"   Retrying... current balance: {current_balance} {base_coin}, target: {target_balance:.6f} ({elapsed}s elapsed)")
-                
-                if not balance_confirmed:
-                    raise ValueError(f"Timeout: Deposit did not arrive after {max_wait}s. Current: {current_balance}, Target: {target_balance:.6f}")
+                target_balance = jupiter_check_balance(base_coin) + (withdrawn_amount * 0.5)
+                arrival = watch_deposit("jupiter", base_coin, target_balance).result()
+                print(f"✅ Deposit confirmed: {arrival['balance']} {base_coin} (waited {arrival['elapsed']:.0f}s)")
+            clock.mark("deposit_observed")
             
             print(f"\n📍 Step 3/3: Sell {base_coin} on Jupiter")
-            sell_balance = jupiter_check_balance(base_coin)
-            J_sell = jupiter_get_rate(base_coin, "USDT", 1)
-            expected_usdt = sell_balance * J_sell
+            jupiter_balances = jupiter_get_all_balances()
+            sell_balance = jupiter_balances.get(base_coin, 0.0)
+            sell_quote, expected_usdt = _jupiter_quote(base_coin, "USDT", sell_balance, 100000)
+            J_sell = expected_usdt / sell_balance
             
             print(f"💰 {base_coin} 余额: {sell_balance:.6f}")
             print(f"📊 Jupiter 预期价格: ${J_sell:.6f}")
             print(f"📊 预计获得: ~{expected_usdt:.2f} USDT")
             
-            initial_usdt = jupiter_check_balance("USDT")
-            jupiter_sell = jupiter_crypto_to_u(base_coin)
-            time.sleep(5)
-            final_usdt = jupiter_check_balance("USDT")
-            actual_usdt = final_usdt - initial_usdt
+            initial_usdt = jupiter_balances.get("USDT", 0.0)
+            if warmed_sell and warmed_sell.exception():
+                print(f"⚠️  Jupiter sell warm-up failed, lookup tables are fetched now: {warmed_sell.exception()}")
+            jupiter_sell = jupiter_crypto_to_u(base_coin, quote=sell_quote)
+            clock.mark("sold")
+            actual_usdt = jupiter_sell["received"]
+            if actual_usdt is None:
+                actual_usdt = jupiter_check_balance("USDT") - initial_usdt
             actual_sell_price = actual_usdt / sell_balance if sell_balance > 0 else 0
             
             print(f"✅ Sold {base_coin} on Jupiter")
@@ -137,18 +145,23 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
             print(f"\n🚀 Executing J→B arbitrage for {base_coin}...")
             
             print(f"\n📍 Step 1/3: Buy {base_coin} on Jupiter")
-            initial_usdt = jupiter_check_balance("USDT")
-            J_buy = jupiter_get_rate(base_coin, "USDT", 1)
-            estimated_qty = initial_usdt / J_buy
+            jupiter_balances = jupiter_get_all_balances()
+            initial_usdt = jupiter_balances.get("USDT", 0.0)
+            buy_quote, estimated_qty = _jupiter_quote("USDT", base_coin, initial_usdt, 50)
+            J_buy = initial_usdt / estimated_qty
             
             print(f"💰 USDT 投入: {initial_usdt:.2f}")
             print(f"📊 Jupiter 预期价格: ${J_buy:.6f}")
             print(f"📊 预计购买数量: ~{estimated_qty:.6f} {base_coin}")
             
-            initial_jupiter_balance = jupiter_check_balance(base_coin)
-            jupiter_buy = jupiter_u_to_crypto(base_coin)
-            expected_amount = jupiter_buy.get("expected_amount", 0)
-            actual_price = initial_usdt / expected_amount if expected_amount > 0 else 0
+            initial_jupiter_balance = jupiter_balances.get(base_coin, 0.0)
+            clock.mark("order")
+            jupiter_buy = jupiter_u_to_crypto(base_coin, quote=buy_quote)
+            clock.mark("balance_confirmed")
+            received_amount = jupiter_buy["received"]
+            if received_amount is None:
+                received_amount = jupiter_check_balance(base_coin) - initial_jupiter_balance
+            actual_price = initial_usdt / received_amount if received_amount > 0 else 0
             
             print(f"✅ Bought {base_coin} on Jupiter")
             print(f"📈 实际成交价: ${actual_price:.6f}")
@@ -156,55 +169,22 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
             
             result['steps'].append({'step': 'jupiter_buy', 'result': jupiter_buy})
             
-            print(f"⏳ Waiting for balance to update (need at least {expected_amount * 0.5:.6f} {base_coin})...")
-            max_wait = 600
-            elapsed = 0
-            target_balance = initial_jupiter_balance + (expected_amount * 0.5)
-            balance_confirmed = False
-            while elapsed < max_wait:
-                time.sleep(10)
-                elapsed += 10
-                current_balance = jupiter_check_balance(base_coin)
-                if current_balance >= target_balance:
-                    print(f"✅ Balance updated: {current_balance} {base_coin} (waited {elapsed}s)")
-                    print(f"⏳ Waiting extra 10 seconds for security...")
-                    time.sleep(10)
-                    balance_confirmed = True
-                    break
-                print(f"   Retrying... current balance: {current_balance} {base_coin}, target: {target_balance:.6f} ({elapsed}s elapsed)")
-            
-            if not balance_confirmed:
-                raise ValueError(f"Timeout: Balance did not update after {max_wait}s. Current: {current_balance}, Target: {target_balance:.6f}")
-            
             print(f"\n📍 Step 2/3: Withdraw {base_coin} from Jupiter to Bybit")
             jupiter_withdrawal = jupiter_withdraw(base_coin)
             withdrawn_amount = jupiter_withdrawal.get('amount', 0) if jupiter_withdrawal else 0
             result['steps'].append({'step': 'jupiter_withdraw', 'result': jupiter_withdrawal})
+            clock.mark("withdrawal_created")
             print(f"✅ Withdrawal sent to Bybit")
             
             if not skip_confirmation:
                 input("⏸️  Press Enter after confirming deposit on Bybit...")
             else:
                 print(f"⏳ Waiting for {base_coin} deposit to arrive on Bybit (need at least {withdrawn_amount * 0.5:.6f})...")
-                initial_bybit_balance = bybit_get_balance(base_coin, "FUND")
-                target_balance = initial_bybit_balance + (withdrawn_amount * 0.5)
-                max_wait = 600
-                elapsed = 0
-                balance_confirmed = False
-                while elapsed < max_wait:
-                    time.sleep(10)
-                    elapsed += 10
-                    current_balance = bybit_get_balance(base_coin, "FUND")
-                    if current_balance >= target_balance:
-                        print(f"✅ Deposit confirmed: {current_balance} {base_coin} (waited {elapsed}s)")
-                        print(f"⏳ Waiting extra 10 seconds for security...")
-                        time.sleep(10)
-                        balance_confirmed = True
-                        break
-                    print(f"   Retrying... current balance: {current_balance} {base_coin}, target: {target_balance:.6f} ({elapsed}s elapsed)")
-                
-                if not balance_confirmed:
-                    raise ValueError(f"Timeout: Deposit did not arrive after {max_wait}s. Current: {current_balance}, Target: {target_balance:.6f}")
+                target_balance = bybit_get_balance(base_coin, "FUND") + (withdrawn_amount * 0.5)
+                tx_sig = jupiter_withdrawal.get("tx_sig") if jupiter_withdrawal else None
+                arrival = watch_deposit("bybit", base_coin, target_balance, "FUND", tx_sig).result()
+                print(f"✅ Deposit confirmed: {arrival['balance']} {base_coin} (waited {arrival['elapsed']:.0f}s)")
+            clock.mark("deposit_observed")
             
             print(f"\n📍 Step 3/3: Sell {base_coin} on Bybit")
             fund_balance = bybit_get_balance(base_coin, "FUND")
@@ -222,7 +202,9 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
             
             initial_usdt = bybit_get_balance("USDT", "UNIFIED")
             bybit_sell = bybit_crypto_to_u(base_coin)
-            time.sleep(3)
+            sell_order = bybit_wait_order(bybit_sell["orderId"])
+            clock.mark("sold")
+            print(f"📦 Sell order {sell_order['orderStatus']}: {sell_order['cumExecQty']} {base_coin}")
             final_usdt = bybit_get_balance("USDT", "UNIFIED")
             actual_usdt = final_usdt - initial_usdt
             actual_sell_price = actual_usdt / total_balance if total_balance > 0 else 0
@@ -235,6 +217,8 @@ def execute_arbitrage(base_coin, direction, skip_confirmation=False):
             result['steps'].append({'step': 'bybit_sell', 'result': bybit_sell})
         
         result['success'] = True
+        # Manual confirmation adds human wait time to the deposit stage, so only automated runs are recorded
+        result['timings'] = clock.finish() if skip_confirmation else None
         print(f"\n🎉 Arbitrage execution completed successfully!")
         
     except Exception as e:
@@ -4,13 +4,18 @@ from main.workflows.execute_arbitrage import execute_arbitrage
 from main.jupiter.account.balance import check_balance as jupiter_check_balance
 from main.bybit.account.balance import get_balance as bybit_get_balance
 
-def run_arbitrage(direction, skip_confirmation=False):
+def run_arbitrage(direction, skip_confirmation=False, max_workers=None, prefilter=False, use_curve=True, rank_by_lockup=False):
     """
     Scan for profitable arbitrage opportunities and execute if found
     
     Args:
         direction: Direction to check ('B→J' or 'J→B')
         skip_confirmation: Skip manual confirmation prompts (default: False)
+        max_workers: If set, scan coins concurrently with this many workers
+        prefilter: Skip coins whose top-of-book spread cannot break even
+        use_curve: Price Jupiter at the real trade size from cached price curves
+                   (default; False uses a 1-token quote plus a fixed slippage)
+        rank_by_lockup: Pick the coin with the best expected profit per minute of capital lockup
     
     Returns:
         dict with keys: 'initial_balance', 'final_balance', 'actual_profit',
@@ -36,7 +41,7 @@ def run_arbitrage(direction, skip_confirmation=False):
         'success': False
     }
     
-    scan_result = scan_all_opportunities(initial_balance, direction)
+    scan_result = scan_all_opportunities(initial_balance, direction, max_workers, prefilter, use_curve, rank_by_lockup)
     result['scan_result'] = scan_result
     
     if not scan_result:
@@ -47,6 +52,12 @@ def run_arbitrage(direction, skip_confirmation=False):
     result['expected_profit'] = expected_profit
     
     print(f"\n📈 预计收益: ${expected_profit:.2f} ({expected_profit/initial_balance:.2%})")
+    if scan_result['optimal_profit'] is not None:
+        print(f"📐 最优规模: ${scan_result['optimal_size']:.2f} → 预计收益 ${scan_result['optimal_profit']:.2f}")
+    else:
+        print("📐 最优规模: 订单簿深度不足，无法估算")
+    if 'lockup' in scan_result:
+        print(f"⏱️  预计资金占用: {scan_result['lockup'] / 60:.1f} 分钟 → ${scan_result['profit_per_minute']:.3f}/分钟")
     
     execution_result = execute_arbitrage(coin, direction, skip_confirmation)
     result['execution_result'] = execution_result
@@ -0,0 +1,159 @@
+"""Transfer latency model: per-stage timings of executed arbitrages as streaming quantile sketches"""
+import json
+import os
+import threading
+import time
+from main.shared.config import LATENCY_PATH, LATENCY_QUANTILES, TRANSFER_DEFAULT_LOCKUP
+
+# Stages marked by execute_arbitrage, in order
+STAGES = ["order", "balance_confirmed", "withdrawal_created", "deposit_observed", "sold"]
+
+_model = None
+_model_lock = threading.Lock()
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (P² algorithm, five markers)"""
+
+    def __init__(self, p, state=None):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+        self.count = 0
+        if state:
+            self.heights, self.positions, self.desired, self.count = state["heights"], state["positions"], state["desired"], state["count"]
+
+    def add(self, x):
+        self.count += 1
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        """Current estimate (exact order statistic until five samples arrived, None before the first)"""
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            return self.heights[round(self.p * (len(self.heights) - 1))]
+        return self.heights[2]
+
+    def state(self):
+        return {"heights": self.heights, "positions": self.positions, "desired": self.desired, "count": self.count}
+
+class LatencyModel:
+    """Quantile sketches of stage durations keyed by coin, direction and stage
+
+    Stage 'a→b' is the time from mark a to mark b of one trade; 'total' runs from
+    the order to the sale, i.e. how long the capital was locked up.
+    """
+
+    def __init__(self, path=LATENCY_PATH, quantiles=LATENCY_QUANTILES):
+        self.path = path
+        self.quantiles = quantiles
+        self.sketches = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for key, states in data.items():
+            self.sketches[key] = {float(p): P2Quantile(float(p), state) for p, state in states.items()}
+
+    def _save(self):
+        data = {key: {str(p): sketch.state() for p, sketch in sketches.items()} for key, sketches in self.sketches.items()}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, coin, direction, stamps):
+        """Fold one trade's stage timestamps ({stage: time.time()}) into the sketches and persist them"""
+        marked = [stage for stage in STAGES if stage in stamps]
+        durations = {f"{a}→{b}": stamps[b] - stamps[a] for a, b in zip(marked, marked[1:])}
+        if "order" in stamps and "sold" in stamps:
+            durations["total"] = stamps["sold"] - stamps["order"]
+        with self.lock:
+            for stage, seconds in durations.items():
+                sketches = self.sketches.setdefault(f"{coin}|{direction}|{stage}", {p: P2Quantile(p) for p in self.quantiles})
+                for sketch in sketches.values():
+                    sketch.add(seconds)
+            self._save()
+        return durations
+
+    def quantile(self, coin, direction, stage="total", p=0.5):
+        """Estimated p-quantile of a stage duration in seconds (None without recorded trades)"""
+        with self.lock:
+            sketch = self.sketches.get(f"{coin}|{direction}|{stage}", {}).get(p)
+            return sketch.value() if sketch else None
+
+    def count(self, coin, direction, stage="total"):
+        with self.lock:
+            sketches = self.sketches.get(f"{coin}|{direction}|{stage}")
+            return next(iter(sketches.values())).count if sketches else 0
+
+    def expected_lockup(self, coin, direction, p=0.5):
+        """Seconds the capital is expected to be in transit (TRANSFER_DEFAULT_LOCKUP without history)"""
+        lockup = self.quantile(coin, direction, "total", p)
+        return lockup if lockup is not None else TRANSFER_DEFAULT_LOCKUP
+
+    def profit_per_minute(self, coin, direction, profit, p=0.5):
+        """Expected profit per minute of capital lockup"""
+        return profit / (self.expected_lockup(coin, direction, p) / 60)
+
+class TransferClock:
+    """Stage timestamps of one execute_arbitrage run"""
+
+    def __init__(self, coin, direction):
+        self.coin = coin
+        self.direction = direction
+        self.stamps = {}
+
+    def mark(self, stage):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}', expected one of {STAGES}")
+        self.stamps[stage] = time.time()
+
+    def finish(self):
+        """Record the marked stages in the shared model, returns the stage durations"""
+        return get_latency_model().record(self.coin, self.direction, self.stamps)
+
+def get_latency_model():
+    """Shared latency model (loaded from LATENCY_PATH on first use)"""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = LatencyModel()
+    return _model
@@ -0,0 +1,27 @@
+"""Test BybitClient functions"""
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from main.bybit.helper.client import get_client
+
+
+def test_sync_time():
+    """Test server clock offset measurement"""
+    offset = get_client().sync_time()
+    print(f"Server clock offset: {offset:.1f} ms")
+
+
+def test_keep_alive(base_coin, n=5):
+    """Time repeated requests over the pooled keep-alive session"""
+    client = get_client()
+    for i in range(n):
+        start = time.time()
+        client.get("/v5/market/orderbook", params={"category": "spot", "symbol": f"{base_coin}USDT", "limit": 1})
+        print(f"Request {i + 1}: {(time.time() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_sync_time()
+    test_keep_alive("SOL")
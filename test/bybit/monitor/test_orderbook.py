@@ -3,7 +3,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from main.bybit.monitor.pricing import get_orderbook
+from main.bybit.monitor.pricing import get_orderbook, get_all_tickers
 
 def test_get_orderbook(base_coin, depth=20):
     """Get orderbook for trading pair"""
@@ -11,6 +11,14 @@ def test_get_orderbook(base_coin, depth=20):
     print(f"Best bid: {book['bids'][0][0]}, Best ask: {book['asks'][0][0]}")
     print(f"Total bids: {len(book['bids'])}, Total asks: {len(book['asks'])}")
 
+def test_get_all_tickers(base_coins):
+    """Get best bid/ask for all spot pairs in one call"""
+    tickers = get_all_tickers()
+    print(f"Tickers for {len(tickers)} USDT pairs")
+    for coin in base_coins:
+        print(f"{coin}: bid {tickers[coin]['bid']}, ask {tickers[coin]['ask']}")
+
 if __name__ == "__main__":
     test_get_orderbook("SOL")
+    test_get_all_tickers(["SOL", "JUP"])
 
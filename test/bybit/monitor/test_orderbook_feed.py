@@ -0,0 +1,64 @@
+"""Test OrderbookFeed against a local WebSocket stand-in and the live Bybit stream"""
+import sys
+import json
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from websockets.sync.server import serve
+from main.bybit.monitor.orderbook_feed import OrderbookFeed, start_orderbook_feed, stop_orderbook_feed
+from main.bybit.monitor.pricing import get_orderbook
+
+# Recorded orderbook.50.SOLUSDT messages: snapshot, two deltas, then a delta with a gap (u jumps 3 → 5)
+RECORDED = [
+    {"topic": "orderbook.50.SOLUSDT", "type": "snapshot", "ts": 1, "data": {"s": "SOLUSDT", "b": [["150.1", "2"], ["150.0", "5"]], "a": [["150.2", "1"], ["150.3", "4"]], "u": 1, "seq": 10}},
+    {"topic": "orderbook.50.SOLUSDT", "type": "delta", "ts": 2, "data": {"s": "SOLUSDT", "b": [["150.1", "0"]], "a": [["150.25", "3"]], "u": 2, "seq": 11}},
+    {"topic": "orderbook.50.SOLUSDT", "type": "delta", "ts": 3, "data": {"s": "SOLUSDT", "b": [["149.9", "7"]], "a": [], "u": 3, "seq": 12}},
+    {"topic": "orderbook.50.SOLUSDT", "type": "delta", "ts": 4, "data": {"s": "SOLUSDT", "b": [], "a": [["150.2", "0"]], "u": 5, "seq": 14}},
+]
+RESYNC_SNAPSHOT = {"topic": "orderbook.50.SOLUSDT", "type": "snapshot", "ts": 5, "data": {"s": "SOLUSDT", "b": [["150.0", "5"]], "a": [["150.3", "4"]], "u": 6, "seq": 15}}
+
+def replay_server(messages, resync_snapshot, port):
+    """Local stand-in: replays recorded messages after the first subscribe, answers resubscribes with a snapshot"""
+    def handler(conn):
+        subscribed = False
+        for raw in conn:
+            request = json.loads(raw)
+            if request.get("op") != "subscribe":
+                continue
+            if not subscribed:
+                subscribed = True
+                for message in messages:
+                    conn.send(json.dumps(message))
+            else:
+                conn.send(json.dumps(resync_snapshot))
+    server = serve(handler, "127.0.0.1", port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_feed_replay(base_coin="SOL", port=8765):
+    """Apply recorded snapshot/delta messages and resync after a sequence gap"""
+    server = replay_server(RECORDED, RESYNC_SNAPSHOT, port)
+    feed = OrderbookFeed([base_coin], url=f"ws://127.0.0.1:{port}").start()
+    feed.wait_ready(5)
+    time.sleep(0.5)
+    book = feed.get_orderbook(base_coin)
+    print(f"Book after replay: bids={book['bids']} asks={book['asks']}")
+    print(f"Resyncs: {feed.resyncs}, live: {feed.is_live(base_coin)}")
+    feed.stop()
+    server.shutdown()
+
+def test_live_feed(base_coins, seconds=5):
+    """Start the shared feed against Bybit and read books through get_orderbook"""
+    feed = start_orderbook_feed(base_coins)
+    print(f"All books ready: {feed.wait_ready(10)}")
+    time.sleep(seconds)
+    for coin in base_coins:
+        book = get_orderbook(coin)
+        print(f"{coin}: live={feed.is_live(coin)} best bid {book['bids'][0][0]}, best ask {book['asks'][0][0]}")
+    stop_orderbook_feed()
+
+if __name__ == "__main__":
+    test_feed_replay("SOL")
+    # test_live_feed(["SOL", "JUP"])
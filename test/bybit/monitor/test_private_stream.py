@@ -0,0 +1,61 @@
+"""Test PrivateStream against a local WebSocket stand-in and the live Bybit private stream"""
+import sys
+import json
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from websockets.sync.server import serve
+from main.bybit.monitor.private_stream import PrivateStream, get_private_stream, stop_private_stream
+
+ORDER_ID = "1834567890123456789"
+
+def private_server(port, fill_delay):
+    """Local stand-in: accepts auth, then pushes an order's lifecycle, its execution and a wallet update"""
+    def handler(conn):
+        for raw in conn:
+            request = json.loads(raw)
+            if request.get("op") == "auth":
+                conn.send(json.dumps({"op": "auth", "success": True, "ret_msg": "", "conn_id": "stand-in"}))
+            elif request.get("op") == "subscribe":
+                conn.send(json.dumps({"op": "subscribe", "success": True}))
+                order = {"orderId": ORDER_ID, "symbol": "SOLUSDT", "side": "Buy", "orderStatus": "New",
+                         "cumExecQty": "0", "cumExecValue": "0", "avgPrice": ""}
+                conn.send(json.dumps({"topic": "order", "creationTime": 1, "data": [order]}))
+                time.sleep(fill_delay)
+                conn.send(json.dumps({"topic": "execution", "creationTime": 2, "data": [
+                    {"orderId": ORDER_ID, "execId": "e1", "execQty": "2", "execPrice": "150.1", "execFee": "0.002"}]}))
+                conn.send(json.dumps({"topic": "order", "creationTime": 2, "data": [
+                    dict(order, orderStatus="Filled", cumExecQty="2", cumExecValue="300.2", avgPrice="150.1")]}))
+                conn.send(json.dumps({"topic": "wallet", "creationTime": 2, "data": [
+                    {"accountType": "UNIFIED", "coin": [{"coin": "SOL", "walletBalance": "1.998"}, {"coin": "USDT", "walletBalance": "0.5"}]}]}))
+    server = serve(handler, "127.0.0.1", port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_stream_stand_in(port=8766, fill_delay=0.5):
+    """Await a fill and a balance threshold, both registered before the pushes arrive"""
+    server = private_server(port, fill_delay)
+    stream = PrivateStream(url=f"ws://127.0.0.1:{port}", auth_args=lambda: ["key", 0, "signature"]).start()
+    print(f"Authenticated: {stream.wait_ready(5)}")
+    start = time.time()
+    order = stream.await_order(ORDER_ID).result(5)
+    print(f"Order {order['orderStatus']}: {order['cumExecQty']} @ {order['avgPrice']} ({time.time() - start:.2f}s after registering)")
+    balance = stream.await_balance("SOL", 1.5).result(5)
+    print(f"SOL balance {balance}, fills: {len(stream.get_fills(ORDER_ID))}")
+    print(f"Already-filled order resolves immediately: {stream.await_order(ORDER_ID).done()}")
+    stream.stop()
+    server.shutdown()
+
+def test_live_stream(seconds=10):
+    """Authenticate against Bybit and print wallet balances pushed during the window"""
+    stream = get_private_stream()
+    print(f"Authenticated: {stream.wait_ready(10)}")
+    time.sleep(seconds)
+    print(f"Pushed balances: {stream.balances}")
+    stop_private_stream()
+
+if __name__ == "__main__":
+    test_stream_stand_in()
+    # test_live_stream()
@@ -0,0 +1,25 @@
+"""Test OrderbookSnapshot"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+import numpy as np
+from main.bybit.monitor.pricing import get_orderbook_snapshot
+
+def test_orderbook_snapshot(base_coin, amount, pct=0.01):
+    """Answer buy/sell rate, depth and slippage questions from one orderbook fetch"""
+    snapshot = get_orderbook_snapshot(base_coin)
+    print(f"Buy {amount} {base_coin} VWAP: ${snapshot.vwap('buy', amount):.4f}, slippage: {snapshot.slippage('buy', amount)*100:.3f}%")
+    print(f"Sell {amount} {base_coin} VWAP: ${snapshot.vwap('sell', amount):.4f}, slippage: {snapshot.slippage('sell', amount)*100:.3f}%")
+    print(f"Ask depth within {pct:.0%}: {snapshot.depth_within('buy', pct)}, bid depth within {pct:.0%}: {snapshot.depth_within('sell', pct)}")
+
+def test_vwap_curve(base_coin, amounts):
+    """Evaluate VWAP and marginal price for many quantities in one call"""
+    snapshot = get_orderbook_snapshot(base_coin)
+    amounts = np.asarray(amounts, dtype=float)
+    for qty, vwap, marginal in zip(amounts, snapshot.vwap("buy", amounts), snapshot.marginal_price("buy", amounts)):
+        print(f"Buy {qty} {base_coin}: VWAP ${vwap:.4f}, marginal ${marginal:.4f}")
+
+if __name__ == "__main__":
+    test_orderbook_snapshot("SOL", 1)
+    test_vwap_curve("SOL", [0.1, 1, 10, 100])
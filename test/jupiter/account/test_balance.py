@@ -3,7 +3,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from main.jupiter.account.balance import check_balance
+from main.jupiter.account.balance import check_balance, get_all_balances
 
 
 def test_check_balance(symbol):
@@ -12,7 +12,15 @@ def test_check_balance(symbol):
     print(f"{symbol} balance: {balance}")
 
 
+def test_get_all_balances():
+    """Fetch every wallet balance in one batched RPC request"""
+    balances = get_all_balances()
+    for symbol, balance in balances.items():
+        print(f"{symbol} balance: {balance}")
+
+
 if __name__ == "__main__":
     test_check_balance("SOL")
     test_check_balance("USDT")
+    test_get_all_balances()
 
@@ -0,0 +1,94 @@
+"""Test send_transaction rebroadcasting against a local Solana RPC stand-in"""
+import sys
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from solana.rpc.api import Client
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+import main.jupiter.helper.client as solana_client
+import main.jupiter.monitor.blockhash as blockhash_module
+import main.jupiter.monitor.confirmations as confirmations_module
+from main.jupiter.monitor.blockhash import BlockhashCache
+from main.jupiter.monitor.confirmations import SignatureTracker
+from main.jupiter.account.sender import send_transaction, landing_log
+
+def rpc_server(port, land_after_sends, height_step, drop_first_blockhash):
+    """Local RPC stand-in that drops transactions until they were sent land_after_sends times
+    
+    Block height grows by height_step per getBlockHeight call; with drop_first_blockhash,
+    transactions signed with the first blockhash served never land.
+    """
+    state = {"height": 1000, "blockhashes": [], "sends": {}}
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            method, params = request["method"], request["params"]
+            if method == "getLatestBlockhash":
+                blockhash = str(Hash.new_unique())
+                state["blockhashes"].append(blockhash)
+                result = {"context": {"slot": 1}, "value": {"blockhash": blockhash, "lastValidBlockHeight": state["height"] + 150}}
+            elif method == "getRecentPrioritizationFees":
+                result = []
+            elif method == "getBlockHeight":
+                state["height"] += height_step
+                result = state["height"]
+            elif method == "sendTransaction":
+                transaction = Transaction.from_bytes(base64.b64decode(params[0]))
+                signature = str(transaction.signatures[0])
+                dropped = drop_first_blockhash and str(transaction.message.recent_blockhash) == state["blockhashes"][0]
+                state["sends"][signature] = state["sends"].get(signature, 0) + (0 if dropped else 1)
+                result = signature
+            elif method == "getTransaction":
+                result = {"slot": 1, "blockTime": None, "transaction": {
+                    "signatures": [params[0]],
+                    "message": {"accountKeys": [], "recentBlockhash": "11111111111111111111111111111111", "instructions": []}
+                }, "meta": {"err": None, "status": {"Ok": None}, "fee": 5000, "preBalances": [], "postBalances": [],
+                            "innerInstructions": [], "logMessages": [], "rewards": [], "preTokenBalances": [], "postTokenBalances": []}}
+            elif method == "getSignatureStatuses":
+                result = {"context": {"slot": 1}, "value": [
+                    {"slot": 1, "confirmations": 1, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"}
+                    if state["sends"].get(signature, 0) >= land_after_sends else None
+                    for signature in params[0]]}
+            body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_rebroadcast_stand_in(port=8903, land_after_sends=3, height_step=0, drop_first_blockhash=False):
+    """Send a self-transfer until the stand-in lets it land, re-signing if its blockhash expires"""
+    server = rpc_server(port, land_after_sends, height_step, drop_first_blockhash)
+    keypair = Keypair()
+    client = Client(f"http://127.0.0.1:{port}")
+    solana_client._client_instance = client
+    blockhash_module._cache = BlockhashCache(client)
+    confirmations_module._tracker = SignatureTracker("ws://127.0.0.1:1", client, str(keypair.pubkey()), poll_interval=0.1).start()
+    def build(blockhash):
+        ix = transfer(TransferParams(from_pubkey=keypair.pubkey(), to_pubkey=keypair.pubkey(), lamports=1))
+        transaction = Transaction.new_unsigned(Message.new_with_blockhash([ix], keypair.pubkey(), blockhash))
+        transaction.sign([keypair], blockhash)
+        return transaction
+    result = send_transaction(build, label="Stand-in transfer", interval=0.3)
+    print(f"Landed {result['tx_sig'][:16]}... after {result['sends']} sends, {result['resigns']} re-signs, {result['time_to_land']:.2f}s")
+    print(f"Landing log: {len(landing_log)} entries")
+    confirmations_module._tracker.stop()
+    confirmations_module._tracker = blockhash_module._cache = solana_client._client_instance = None
+    server.shutdown()
+
+if __name__ == "__main__":
+    test_rebroadcast_stand_in()
+    test_rebroadcast_stand_in(port=8904, land_after_sends=1, height_step=100, drop_first_blockhash=True)
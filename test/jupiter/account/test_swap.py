@@ -3,7 +3,9 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from main.jupiter.account.swap import crypto_to_u, u_to_crypto
+from main.jupiter.account.swap import crypto_to_u, u_to_crypto, prepare_swap
+from main.jupiter.monitor.pricing import get_quote
+from main.shared.data import get_token_info
 
 
 def test_crypto_to_u(symbol):
@@ -22,7 +24,19 @@ def test_u_to_crypto(symbol):
     print(f"Expected amount: {result['expected_amount']} {symbol}")
 
 
+def test_prepare_swap(symbol, usdt_amount):
+    """Build and sign a USDT -> crypto swap locally without sending it"""
+    usdt, token = get_token_info("USDT"), get_token_info(symbol)
+    quote = get_quote(usdt["mint"], token["mint"], int(usdt_amount * 10 ** usdt["decimals"]))
+    prepared = prepare_swap(quote)
+    message = prepared["transaction"].message
+    print(f"Transaction size: {len(bytes(prepared['transaction']))} bytes")
+    print(f"Instructions: {len(message.instructions)}, lookup tables: {len(message.address_table_lookups)}")
+    print(f"Valid until block height: {prepared['last_valid_block_height']}")
+
+
 if __name__ == "__main__":
+    test_prepare_swap("JUP", 10)
     # test_crypto_to_u("USDC")
     test_u_to_crypto("USDC")
     pass
@@ -1,10 +1,11 @@
 """Test jupiter_helpers functions"""
 import sys
 import json
+import time
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from main.jupiter.monitor.pricing import get_quote
+from main.jupiter.monitor.pricing import get_quote, get_cached_quote
 
 
 def test_get_jupiter_quote(from_mint, to_mint, amount):
@@ -54,6 +55,14 @@ def test_get_jupiter_quote(from_mint, to_mint, amount):
         print("❌ Failed to get quote")
 
 
+def test_cached_quote(from_mint, to_mint, amount):
+    """Second quote for the same pair and amount within the TTL comes from the cache"""
+    for attempt in range(2):
+        start = time.time()
+        quote = get_cached_quote(from_mint, to_mint, amount)
+        print(f"Attempt {attempt + 1}: outAmount={quote.get('outAmount') if quote else None} in {(time.time() - start) * 1000:.1f}ms")
+
+
 if __name__ == "__main__":
     sol_mint = "So11111111111111111111111111111111111111112"
     usdt_mint = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
@@ -68,4 +77,6 @@ if __name__ == "__main__":
     print("Test 2: SOL -> USDC (1 SOL)")
     print("="*60)
     test_get_jupiter_quote(sol_mint, usdc_mint, 1000000000)  # 1 SOL
+    
+    test_cached_quote(sol_mint, usdt_mint, 100000000)
 
@@ -0,0 +1,58 @@
+"""Test RpcPool routing, hedging and failover against local RPC stand-ins with injected delays"""
+import sys
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from solana.rpc.commitment import Confirmed
+from main.jupiter.helper.rpc_pool import RpcPool, PooledClient
+
+def rpc_server(port, delay):
+    """Local HTTP RPC stand-in answering getSlot after delay["seconds"] (status delay["status"] if set)"""
+    calls = {"count": 0}
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            calls["count"] += 1
+            time.sleep(delay["seconds"])
+            body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": port}).encode()
+            self.send_response(delay.get("status", 200))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, calls
+
+def test_pool_stand_in(ports=(8911, 8912)):
+    """Warm up, route to the fast node, hedge when it stalls, fail over when it errors"""
+    delays = [{"seconds": 0.05}, {"seconds": 0.2}]
+    servers = [rpc_server(port, delay) for port, delay in zip(ports, delays)]
+    pool = RpcPool([f"http://127.0.0.1:{port}" for port in ports], hedge_after=0.3)
+    client = PooledClient(pool, commitment=Confirmed)
+
+    for _ in range(6):
+        client.get_slot()
+    print(f"After warm-up: {pool.stats()}")
+    print(f"Routed to: {client.get_slot().value}")
+
+    delays[0]["seconds"] = 2
+    start = time.time()
+    print(f"Hedged read answered by {client.get_slot().value} in {time.time() - start:.2f}s")
+
+    delays[0].update(seconds=0, status=500)
+    for _ in range(4):
+        client.get_slot()
+    print(f"Failover answered by {client.get_slot().value}, stats: {pool.stats()}")
+    print(f"Calls per node: {[calls['count'] for _, calls in servers]}")
+    for server, _ in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_pool_stand_in()
@@ -0,0 +1,61 @@
+"""Test BlockhashCache against a local Solana RPC stand-in and the configured RPC"""
+import sys
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from solana.rpc.api import Client
+from solders.hash import Hash
+import main.jupiter.helper.client as solana_client
+from main.jupiter.monitor.blockhash import BlockhashCache, get_blockhash_cache
+
+def rpc_server(port):
+    """Local HTTP RPC stand-in: a new blockhash per call and fixed recent prioritization fees"""
+    calls = {"getLatestBlockhash": 0}
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if request["method"] == "getLatestBlockhash":
+                calls["getLatestBlockhash"] += 1
+                result = {"context": {"slot": 100}, "value": {
+                    "blockhash": str(Hash.new_unique()), "lastValidBlockHeight": 1000 + calls["getLatestBlockhash"]}}
+            else:
+                result = [{"slot": 100 + i, "prioritizationFee": fee} for i, fee in enumerate([0, 0, 5000, 20000, 100000])]
+            body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, calls
+
+def test_cache_stand_in(port=8901, seconds=1.2):
+    """Reads come from memory while the background thread keeps refreshing"""
+    server, calls = rpc_server(port)
+    solana_client._client_instance = Client(f"http://127.0.0.1:{port}")
+    cache = BlockhashCache(interval=0.3).start()
+    time.sleep(seconds)
+    start = time.time()
+    blockhash, last_valid = cache.get_blockhash()
+    print(f"Blockhash {blockhash} valid until height {last_valid}, read in {(time.time() - start) * 1e6:.0f} µs")
+    print(f"Refreshes: {calls['getLatestBlockhash']}, compute-unit price: {cache.priority_fee} µlamports")
+    print(f"Compute budget instructions: {len(cache.compute_budget_instructions(10000))}")
+    cache.stop()
+    server.shutdown()
+    solana_client._client_instance = None
+
+def test_live_cache():
+    """Warm the shared cache on the configured RPC"""
+    cache = get_blockhash_cache()
+    print(f"Blockhash: {cache.get_blockhash()}, compute-unit price: {cache.priority_fee} µlamports")
+
+if __name__ == "__main__":
+    test_cache_stand_in()
+    # test_live_cache()
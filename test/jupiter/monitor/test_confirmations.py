@@ -0,0 +1,105 @@
+"""Test SignatureTracker against a local Solana RPC stand-in (HTTP + WebSocket)"""
+import sys
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from solana.rpc.api import Client
+from solders.keypair import Keypair
+from websockets.sync.server import serve
+from main.jupiter.monitor.confirmations import SignatureTracker, confirm
+
+USDT_MINT = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+JUP_MINT = "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+def token_balance(index, mint, amount, owner):
+    return {"accountIndex": index, "mint": mint, "owner": owner, "programId": TOKEN_PROGRAM,
+            "uiTokenAmount": {"uiAmount": amount / 1e6, "decimals": 6, "amount": str(amount), "uiAmountString": str(amount / 1e6)}}
+
+def swap_transaction(signature, owner):
+    """getTransaction result of a 10 USDT → 5 JUP swap paying a 5000 lamport fee"""
+    return {"slot": 100, "blockTime": None, "version": 0, "transaction": {
+        "signatures": [signature],
+        "message": {"accountKeys": [{"pubkey": owner, "writable": True, "signer": True, "source": "transaction"}],
+                    "recentBlockhash": "11111111111111111111111111111111", "instructions": []}
+    }, "meta": {
+        "err": None, "status": {"Ok": None}, "fee": 5000, "preBalances": [1000000000], "postBalances": [999995000],
+        "innerInstructions": [], "logMessages": [], "rewards": [],
+        "preTokenBalances": [token_balance(1, USDT_MINT, 10000000, owner)],
+        "postTokenBalances": [token_balance(1, USDT_MINT, 0, owner), token_balance(2, JUP_MINT, 5000000, owner)]
+    }}
+
+def rpc_server(owner, port, land_after=1.0):
+    """Local HTTP RPC stand-in: signatures report 'confirmed' land_after seconds after the first status poll"""
+    first_poll = {}
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            params = request["params"]
+            if request["method"] == "getSignatureStatuses":
+                statuses = []
+                for signature in params[0]:
+                    first_poll.setdefault(signature, time.time())
+                    landed = time.time() - first_poll[signature] >= land_after
+                    statuses.append({"slot": 100, "confirmations": 1, "err": None, "status": {"Ok": None}, "confirmationStatus": "confirmed"} if landed else None)
+                result = {"context": {"slot": 101}, "value": statuses}
+            else:
+                result = swap_transaction(params[0], owner)
+            body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def ws_server(port, notify_after=0.2):
+    """Local WebSocket stand-in: acks signatureSubscribe and notifies after notify_after seconds"""
+    def handler(conn):
+        for raw in conn:
+            request = json.loads(raw)
+            subscription = request["id"] + 1000
+            conn.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscription}))
+            time.sleep(notify_after)
+            conn.send(json.dumps({"jsonrpc": "2.0", "method": "signatureNotification", "params": {
+                "result": {"context": {"slot": 100}, "value": {"err": None}}, "subscription": subscription}}))
+    server = serve(handler, "127.0.0.1", port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_tracker_stand_in(rpc_port=8899, ws_port=8900):
+    """Confirm one signature over the WebSocket and one via status polling (no WebSocket)"""
+    owner = str(Keypair().pubkey())
+    rpc = rpc_server(owner, rpc_port)
+    ws = ws_server(ws_port)
+    client = Client(f"http://127.0.0.1:{rpc_port}")
+    signature = str(Keypair().sign_message(b"ws"))
+    tracker = SignatureTracker(f"ws://127.0.0.1:{ws_port}", client, owner).start()
+    time.sleep(0.3)
+    result = tracker.wait(signature, timeout=5)
+    print(f"WebSocket: confirmed in {result['elapsed']:.2f}s, deltas {result['deltas']}")
+    tracker.stop()
+    ws.shutdown()
+    signature = str(Keypair().sign_message(b"poll"))
+    tracker = SignatureTracker(f"ws://127.0.0.1:{ws_port + 1}", client, owner, poll_interval=0.2).start()
+    result = tracker.wait(signature, timeout=5)
+    print(f"Polling: confirmed in {result['elapsed']:.2f}s, deltas {result['deltas']}")
+    tracker.stop()
+    rpc.shutdown()
+
+def test_confirm(signature):
+    """Wait for a real signature on the configured RPC"""
+    result = confirm(signature)
+    print(f"Confirmed at slot {result['slot']} in {result['elapsed']:.2f}s, deltas {result['deltas']}")
+
+if __name__ == "__main__":
+    test_tracker_stand_in()
+    # test_confirm("<signature>")
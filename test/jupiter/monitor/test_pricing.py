@@ -3,7 +3,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from main.jupiter.monitor.pricing import get_exchange_rate, get_quote
+from main.jupiter.monitor.pricing import get_exchange_rate, get_quote, get_prices, get_quotes, get_exchange_rates, get_price_curve, curve_price
 from main.shared.data import get_token_info
 
 
@@ -28,6 +28,39 @@ def test_get_exchange_rate(from_symbol, to_symbol, amount):
     return rate
 
 
+def test_get_prices(symbols):
+    """Get USD prices for many tokens in one request"""
+    prices = get_prices(symbols)
+    for symbol in symbols:
+        print(f"{symbol}: {prices.get(symbol)}")
+    return prices
+
+
+def test_get_quotes(symbols, amount, max_concurrency=8):
+    """Quote many tokens into USDT concurrently over one HTTP/2 client"""
+    usdt = get_token_info("USDT")
+    infos = [get_token_info(s) for s in symbols]
+    results = get_quotes([(info["mint"], usdt["mint"], int(amount * 10 ** info["decimals"])) for info in infos], max_concurrency)
+    for symbol, result in zip(symbols, results):
+        out = result["quote"]["outAmount"] if result["status"] == "ok" else result["error"]
+        print(f"{symbol}: {result['status']} {out}")
+    print(f"Rates: {get_exchange_rates(symbols, 'USDT', amount, max_concurrency)}")
+    return results
+
+
+def test_get_price_curve(symbol, side, max_usdt, size):
+    """Build the size → effective price curve and interpolate at a trade size"""
+    curve = get_price_curve(symbol, side, max_usdt)
+    unit = "USDT" if side == "buy" else symbol
+    for s, p in zip(curve["sizes"], curve["prices"]):
+        print(f"{side} {s:.4f} {unit}: ${p:.6f}")
+    print(f"Interpolated price at {size} {unit}: ${curve_price(curve, size):.6f}")
+    return curve
+
+
 if __name__ == "__main__":
     test_get_exchange_rate("GRASS", "USDT", 1)
+    test_get_prices(["SOL", "JUP", "GRASS"])
+    test_get_quotes(["SOL", "JUP", "GRASS"], 1)
+    test_get_price_curve("SOL", "buy", 200, 100)
     
@@ -2,12 +2,15 @@
 测试双向套利条件计算 (Bybit ↔ Jupiter)
 """
 import sys
+import numpy as np
 sys.path.append('/Users/side/Desktop/arbitrage')
 
 from main.workflows.arbitrage_calc import (
     is_b2j_profitable, get_b2j_max_slippage,
-    is_j2b_profitable, get_j2b_max_slippage
+    is_j2b_profitable, get_j2b_max_slippage,
+    find_optimal_size
 )
+from main.bybit.monitor.pricing import OrderbookSnapshot
 
 def test_b2j_profitable():
     """测试 Bybit → Jupiter 盈利性判断"""
@@ -116,6 +119,25 @@ def test_j2b_max_slippage():
     print(f"  说明: 这是在盈亏平衡点时Jupiter能承受的最大滑点")
     print()
 
+def test_profitable_with_curve(sizes, prices):
+    """测试使用 Jupiter 价格曲线（按实际交易规模插值）计算盈利性"""
+    curve = {"sizes": np.array(sizes), "prices": np.array(prices)}
+    profitable, profit = is_j2b_profitable(1.0, 1.05, 100, 0.001, curve)
+    print(f"J→B 使用价格曲线: {profitable}, 预期利润: ${profit:.4f} USDT (J@100U={np.interp(99.998, curve['sizes'], curve['prices']):.4f})")
+    profitable, profit = is_b2j_profitable(1.0, 1.05, 100, 0.5, 0.005, curve)
+    print(f"B→J 使用价格曲线: {profitable}, 预期利润: ${profit:.4f} USDT")
+    print()
+
+def test_find_optimal_size(direction, bids, asks, max_U, J):
+    """测试在投入规模网格上求解利润最大的 U"""
+    snapshot = OrderbookSnapshot(bids, asks)
+    result = find_optimal_size(direction, snapshot, max_U, w=0.1, J=J)
+    if result['profit'] is None:
+        print(f"{direction} 最优规模: 订单簿深度不足 (U={result['size']:.2f})")
+    else:
+        print(f"{direction} 最优规模: U={result['size']:.2f}, 预期利润: ${result['profit']:.4f} USDT")
+    print()
+
 if __name__ == "__main__":
     print()
     print("=" * 60)
@@ -128,4 +150,7 @@ if __name__ == "__main__":
     print()
     test_j2b_profitable()
     test_j2b_max_slippage()
+    test_profitable_with_curve([1, 10, 100, 200], [1.0, 1.001, 1.01, 1.02])
+    test_find_optimal_size('J→B', [(1.06, 20), (1.05, 30), (1.0, 100)], [(1.07, 100)], 100, 1.0)
+    test_find_optimal_size('B→J', [(0.99, 100)], [(1.0, 0.5)], 100, 1.05)
 
@@ -2,7 +2,7 @@
 import sys
 sys.path.append('/Users/side/Desktop/arbitrage')
 
-from main.workflows.check_arbitrage import check_arbitrage, scan_all_opportunities
+from main.workflows.check_arbitrage import check_arbitrage, scan_all_opportunities, scan_opportunities_concurrent, prefilter_symbols, rank_opportunities, OpportunityRanking, iter_opportunities
 
 def test_check_arbitrage(base_coin="SOL", usdt_balance=100, direction="J→B"):
     result = check_arbitrage(base_coin, usdt_balance, direction)
@@ -31,8 +31,64 @@ def test_scan_all_opportunities(usdt_balance=100, direction="J→B"):
     
     return opportunity
 
+def test_scan_opportunities_concurrent(usdt_balance=100, direction="J→B", max_workers=8):
+    import time
+    print(f"\nScanning all coins concurrently [{direction}]...")
+    start = time.time()
+    results = scan_opportunities_concurrent(usdt_balance, direction, max_workers)
+    profitable = [r for r in results if r['profitable']]
+    print(f"Checked {len(results)} coins in {time.time() - start:.1f}s, {len(profitable)} profitable")
+    for r in profitable:
+        print(f"  {r['coin']} profit=${r['profit']:.2f}")
+    return results
+
+def test_scan_rank_by_lockup(usdt_balance=100, direction="B→J", max_workers=8):
+    opportunity = scan_all_opportunities(usdt_balance, direction, max_workers, rank_by_lockup=True)
+    if opportunity:
+        print(f"Best per minute: {opportunity['coin']} profit=${opportunity['profit']:.2f} lockup={opportunity['lockup'] / 60:.1f}min → ${opportunity['profit_per_minute']:.3f}/min")
+    else:
+        print(f"No opportunities found")
+    return opportunity
+
+def test_rank_opportunities(usdt_balance=100, direction="B→J", k=5, max_workers=8):
+    import threading
+    import time
+    ranking = OpportunityRanking(k)
+    scan = threading.Thread(target=rank_opportunities, args=(usdt_balance, direction, k, max_workers), kwargs={"ranking": ranking})
+    scan.start()
+    time.sleep(3)
+    print(f"\nPartial ranking after {ranking.checked}/{ranking.total} coins: {[r['coin'] for r in ranking.top()]}")
+    scan.join()
+    print(f"Top {k} of {ranking.checked} coins [{direction}]:")
+    for r in ranking.top():
+        print(f"  {r['coin']} score={r['score']:.2f} profit=${r['profit']:.2f} ({r['profit_pct']:.2%}) headroom={r['headroom']:.2%}")
+    return ranking.top()
+
+def test_iter_opportunities(usdt_balance=100, direction="B→J", min_profit=1.0, deadline=30, max_workers=8):
+    import time
+    start = time.time()
+    checked = 0
+    for result in iter_opportunities(usdt_balance, direction, max_workers, deadline=deadline):
+        checked += 1
+        print(f"  {time.time() - start:5.1f}s {result['coin']} profit=${result['profit']:.2f} headroom={result['headroom']:.2%}")
+        if result['profitable'] and result['profit'] >= min_profit:
+            print(f"Stopping early on {result['coin']} after {checked} coins")
+            return result
+    print(f"No result above ${min_profit:.2f} in {checked} coins")
+    return None
+
+def test_prefilter_symbols(usdt_balance=100, direction="J→B"):
+    passed = prefilter_symbols(usdt_balance, direction)
+    print(f"Coins worth a full check [{direction}]: {passed}")
+    return passed
+
 if __name__ == "__main__":
     # test_check_arbitrage("SOL", 100, "B→J")
     # test_check_arbitrage("SOL", 100, "J→B")
     test_scan_all_opportunities(100, "J→B")
+    # test_scan_opportunities_concurrent(100, "J→B", 8)
+    # test_scan_rank_by_lockup(100, "B→J", 8)
+    # test_rank_opportunities(100, "B→J", 5, 8)
+    # test_iter_opportunities(100, "B→J", 1.0, 30, 8)
+    # test_prefilter_symbols(100, "B→J")
 
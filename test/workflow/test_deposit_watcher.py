@@ -0,0 +1,52 @@
+"""测试充值到账监听（本地 Solana WebSocket 替身推送账户变化、实盘等待）"""
+import sys
+import json
+import threading
+import time
+sys.path.append('/Users/side/Desktop/arbitrage')
+
+from websockets.sync.server import serve
+from solders.keypair import Keypair
+import main.jupiter.helper.client as solana_client
+import main.workflows.deposit_watcher as deposit_watcher
+from main.workflows.deposit_watcher import DepositWatcher, watch_deposit
+
+def account_server(port, arrive_after, balance):
+    """本地替身：收到 accountSubscribe 后，arrive_after 秒时余额到账并推送 accountNotification"""
+    def handler(conn):
+        for raw in conn:
+            request = json.loads(raw)
+            conn.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": 7}))
+            time.sleep(arrive_after)
+            balance["value"] = 10.0
+            conn.send(json.dumps({"jsonrpc": "2.0", "method": "accountNotification", "params": {"subscription": 7, "result": {}}}))
+    server = serve(handler, "127.0.0.1", port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_push_wakes_poll(port=8767, arrive_after=1.0):
+    """账户推送应在到账后立即唤醒轮询，而不是等到下一次轮询间隔"""
+    balance = {"value": 0.0}
+    server = account_server(port, arrive_after, balance)
+    deposit_watcher.SOLANA_WS_URL = f"ws://127.0.0.1:{port}"
+    solana_client._wallet = solana_client.Wallet(Keypair())
+    watcher = DepositWatcher()
+    watcher._balance = lambda venue, coin, account_type: balance["value"]
+    first_delay = watcher.next_delay("jupiter", "USDT", 0)
+    arrival = watcher.watch("jupiter", "USDT", 5.0).result(30)
+    print(f"到账: {arrival['balance']} USDT，耗时 {arrival['elapsed']:.2f}s（无推送时首次轮询间隔 {first_delay:.0f}s）")
+    print(f"到账时间估计: {watcher.arrivals}")
+    server.shutdown()
+    solana_client._wallet = None
+
+def test_live_deposit(venue="jupiter", coin="USDT", amount=1.0):
+    """实盘：等待当前余额再增加 amount"""
+    from main.jupiter.account.balance import get_token_balance
+    from main.bybit.account.balance import get_balance
+    current = get_token_balance(coin) if venue == "jupiter" else get_balance(coin, "FUND")
+    arrival = watch_deposit(venue, coin, current + amount).result()
+    print(f"{venue} {coin} 到账: {arrival['balance']}，耗时 {arrival['elapsed']:.0f}s")
+
+if __name__ == "__main__":
+    test_push_wakes_poll()
+    # test_live_deposit("jupiter", "USDT", 1.0)
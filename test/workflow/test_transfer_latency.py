@@ -0,0 +1,43 @@
+"""测试资金在途时间模型（P² 流式分位数、持久化、按每分钟收益排序）"""
+import sys
+import os
+import random
+import tempfile
+import numpy as np
+sys.path.append('/Users/side/Desktop/arbitrage')
+
+import main.workflows.transfer_latency as transfer_latency
+from main.workflows.transfer_latency import P2Quantile, LatencyModel, get_latency_model
+from main.workflows.check_arbitrage import rank_by_profit_rate
+
+def test_p2_accuracy(samples=5000):
+    """P² 估计值应接近精确分位数"""
+    values = [random.lognormvariate(5, 0.6) for _ in range(samples)]
+    for p in (0.5, 0.9):
+        sketch = P2Quantile(p)
+        for value in values:
+            sketch.add(value)
+        print(f"p{int(p * 100)}: P²={sketch.value():.1f}s, 精确={np.quantile(values, p):.1f}s")
+
+def test_model_and_ranking():
+    """记录两个币的交易阶段时间，重新加载后按每分钟收益排序"""
+    path = os.path.join(tempfile.mkdtemp(), "transfer_latency.json")
+    model = LatencyModel(path)
+    for _ in range(20):
+        start = random.uniform(0, 1000)
+        model.record("SOL", "B→J", {"order": start, "balance_confirmed": start + 1, "withdrawal_created": start + 3,
+                                    "deposit_observed": start + random.uniform(60, 90), "sold": start + 95})
+        model.record("JUP", "B→J", {"order": start, "sold": start + random.uniform(1500, 1800)})
+    transfer_latency._model = LatencyModel(path)
+    reloaded = get_latency_model()
+    print(f"SOL 提币→到账 p50: {reloaded.quantile('SOL', 'B→J', 'withdrawal_created→deposit_observed'):.1f}s")
+    print(f"SOL 总占用 p50/p90: {reloaded.quantile('SOL', 'B→J'):.0f}s / {reloaded.quantile('SOL', 'B→J', p=0.9):.0f}s, 样本 {reloaded.count('SOL', 'B→J')}")
+    results = [{"coin": "JUP", "profitable": True, "profit": 5.0}, {"coin": "SOL", "profitable": True, "profit": 1.0},
+               {"coin": "WIF", "profitable": False, "profit": -1.0}]
+    for r in rank_by_profit_rate(results, "B→J"):
+        print(f"  {r['coin']}: profit=${r['profit']:.2f} lockup={r['lockup'] / 60:.1f}min → ${r['profit_per_minute']:.3f}/min")
+    transfer_latency._model = None
+
+if __name__ == "__main__":
+    test_p2_accuracy()
+    test_model_and_ranking()